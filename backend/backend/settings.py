@@ -94,3 +94,7 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 # Default primary key
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Run kolam image preprocessing through OpenCL when a device is available.
+# Off by default: enabling it switches OpenCV to OpenCL for the whole process.
+KOLAM_USE_OPENCL = False
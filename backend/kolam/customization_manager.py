@@ -1,124 +1,267 @@
 from .zen_kolam_generator import zen_kolam_generator
-import json
+from functools import lru_cache, partial
+import pickle
+import numpy as np
+from .jit import njit, NUMBA_AVAILABLE
+
+@njit(cache=True, fastmath=True)
+def _affine_kernel(pts, m, t):
+    """Apply `p @ m.T + t` to every point of an (N, 2) array in a single pass"""
+    out = np.empty_like(pts)
+    for i in range(pts.shape[0]):
+        x = pts[i, 0]
+        y = pts[i, 1]
+        out[i, 0] = m[0, 0] * x + m[0, 1] * y + t[0]
+        out[i, 1] = m[1, 0] * x + m[1, 1] * y + t[1]
+    return out
+
+
+def _transform_points(pts, m, t):
+    """Apply the affine map (m, t) to an (N, 2) point array.
+
+    Uses the compiled kernel when Numba is installed and a matmul otherwise.
+    """
+    if NUMBA_AVAILABLE:
+        return _affine_kernel(pts, m, t)
+    return pts @ m.T + t
+
+
+def _reflection(symmetry, center_x, center_y):
+    """2x2 matrix and translation for a reflection through the pattern center"""
+    if symmetry == 'horizontal':
+        return np.array([[1.0, 0.0], [0.0, -1.0]]), np.array([0.0, 2 * center_y])
+    if symmetry == 'vertical':
+        return np.array([[-1.0, 0.0], [0.0, 1.0]]), np.array([2 * center_x, 0.0])
+    # Diagonal: swap x and y around the center
+    return np.array([[0.0, -1.0], [-1.0, 0.0]]), np.array([2 * center_y, 2 * center_x])
+
+
+# Above this many estimated nodes a pickle round-trip clones faster than _py_clone
+_PICKLE_CLONE_THRESHOLD = 256
+
+
+def _estimate_size(obj):
+    """Rough node count of JSON-shaped data, looking two levels deep.
+
+    Counts the items of top-level containers plus the points of any curves,
+    which dominate the size of a pattern.
+    """
+    if type(obj) is dict:
+        values = obj.values()
+    elif type(obj) is list:
+        values = obj
+    else:
+        return 0
+    
+    size = len(obj)
+    for value in values:
+        if type(value) is list:
+            size += len(value)
+            for item in value:
+                if type(item) is dict and 'curvePoints' in item:
+                    size += len(item['curvePoints'])
+        elif type(value) is dict:
+            size += len(value) + len(value.get('curvePoints', ()))
+    return size
+
+
+def _py_clone(obj):
+    """Recursively copy dict/list/scalar nodes"""
+    if type(obj) is dict:
+        return {key: _py_clone(value) for key, value in obj.items()}
+    if type(obj) is list:
+        return [_py_clone(item) for item in obj]
+    return obj
+
+
+def _fast_clone(obj):
+    """Deep-copy JSON-shaped pattern data.
+
+    Only dict, list and scalar nodes are expected, which covers the whole kolam
+    pattern schema. Large patterns go through a pickle round-trip, which walks
+    the object graph in C; small ones use the recursive _py_clone, which has a
+    lower constant cost.
+    """
+    if _estimate_size(obj) > _PICKLE_CLONE_THRESHOLD:
+        return pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+    return _py_clone(obj)
+
+
+def _freeze_options(options):
+    """Canonical hashable key for customization options, or None if unhashable"""
+    try:
+        key = tuple(sorted(options.items()))
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+def _gather_points(curves):
+    """Stack the packed points of all curves into one (N, 2) array.
+
+    Returns the array together with the offsets of each curve inside it, so the
+    transformed points can be sliced back per curve.
+    """
+    lengths = [len(curve['_pts']) for curve in curves]
+    pts = np.concatenate([curve['_pts'] for curve in curves]) if curves else np.empty((0, 2))
+    offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+    return pts, offsets
+
+
+def _scatter_points(curves, pts, offsets):
+    """Build new curves from `curves` using the transformed points in `pts`"""
+    new_curves = []
+    for index, curve in enumerate(curves):
+        new_curve = curve.copy()
+        new_curve['_pts'] = pts[offsets[index]:offsets[index + 1]]
+        new_curves.append(new_curve)
+    return new_curves
+
 
 class CustomizationManager:
     def __init__(self):
         self.kolam_generator = zen_kolam_generator
+        self._cached_pipeline = lru_cache(maxsize=32)(self._compile_frozen_pipeline)
     
-    def apply_customization(self, pattern_data, customization_options):
-        """Apply customization options to a kolam pattern"""
-        # Clone the pattern data
-        customized_pattern = pattern_data.copy()
+    def _pack_points(self, curve):
+        """Return a copy of the curve with its curvePoints stored as an (N, 2) array"""
+        packed = curve.copy()
+        if 'curvePoints' in packed:
+            points = packed.pop('curvePoints')
+            packed['_pts'] = np.array([[point['x'], point['y']] for point in points], dtype=np.float64).reshape(-1, 2)
+        return packed
+    
+    def _unpack_points(self, curve):
+        """Return a copy of the curve with its packed points converted back to dicts"""
+        if '_pts' not in curve:
+            return curve
+        unpacked = curve.copy()
+        pts = unpacked.pop('_pts')
+        unpacked['curvePoints'] = [{'x': x, 'y': y} for x, y in pts.tolist()]
+        return unpacked
+    
+    def _set_line_thickness(self, pattern, line_thickness):
+        """Apply line thickness"""
+        pattern['line_thickness'] = line_thickness
+        return pattern
+    
+    def _set_dot_size(self, pattern, dot_size):
+        """Apply dot size"""
+        if 'dots' in pattern:
+            for dot in pattern['dots']:
+                dot['radius'] = dot_size
+        return pattern
+    
+    def _apply_sparse_density(self, pattern):
+        """Remove some curves to make the pattern sparser"""
+        if 'curves' in pattern:
+            pattern['curves'] = pattern['curves'][::2]
+        return pattern
+    
+    def _apply_dense_density(self, pattern):
+        """Add more curves to make the pattern denser"""
+        if 'curves' in pattern:
+            # Duplicate and slightly offset some curves
+            selected = pattern['curves'][::2]  # Take every other curve
+            packed = [curve for curve in selected if '_pts' in curve]
+            pts, offsets = _gather_points(packed)
+            pts = _transform_points(pts, np.eye(2), np.array([2.0, 2.0]))
+            shifted = iter(_scatter_points(packed, pts, offsets))
+            pattern['curves'] = pattern['curves'] + [
+                next(shifted) if '_pts' in curve else curve.copy() for curve in selected
+            ]
+        return pattern
+    
+    def _compile_pipeline(self, customization_options):
+        """Resolve customization options into the ordered steps they enable.
+
+        Each step takes a packed pattern and returns it, so applying options is
+        a plain loop with no per-call option dispatch.
+        """
+        pipeline = []
         
-        # Apply line thickness
         if 'line_thickness' in customization_options:
-            customized_pattern['line_thickness'] = customization_options['line_thickness']
+            pipeline.append(partial(self._set_line_thickness, line_thickness=customization_options['line_thickness']))
         
-        # Apply dot size
         if 'dot_size' in customization_options:
-            if 'dots' in customized_pattern:
-                for dot in customized_pattern['dots']:
-                    dot['radius'] = customization_options['dot_size']
+            pipeline.append(partial(self._set_dot_size, dot_size=customization_options['dot_size']))
         
-        # Apply pattern density
-        if 'pattern_density' in customization_options:
-            density = customization_options['pattern_density']
-            if density == 'sparse':
-                # Remove some curves to make it sparser
-                if 'curves' in customized_pattern:
-                    customized_pattern['curves'] = customized_pattern['curves'][::2]
-            elif density == 'dense':
-                # Add more curves to make it denser
-                if 'curves' in customized_pattern:
-                    # Duplicate and slightly modify some curves
-                    original_curves = customized_pattern['curves'].copy()
-                    for curve in original_curves[::2]:  # Take every other curve
-                        new_curve = curve.copy()
-                        if 'curvePoints' in new_curve:
-                            # Slightly offset the curve points
-                            for point in new_curve['curvePoints']:
-                                point['x'] += 2
-                                point['y'] += 2
-                        customized_pattern['curves'].append(new_curve)
+        density = customization_options.get('pattern_density')
+        if density == 'sparse':
+            pipeline.append(self._apply_sparse_density)
+        elif density == 'dense':
+            pipeline.append(self._apply_dense_density)
         
-        # Apply symmetry type
-        if 'symmetry_type' in customization_options:
-            symmetry = customization_options['symmetry_type']
-            if symmetry == 'horizontal':
-                customized_pattern = self._apply_horizontal_symmetry(customized_pattern)
-            elif symmetry == 'vertical':
-                customized_pattern = self._apply_vertical_symmetry(customized_pattern)
-            elif symmetry == 'diagonal':
-                customized_pattern = self._apply_diagonal_symmetry(customized_pattern)
-            # 'radial' is the default, no changes needed
+        # 'radial' is the default, no changes needed
+        symmetry = customization_options.get('symmetry_type')
+        if symmetry in ('horizontal', 'vertical', 'diagonal'):
+            pipeline.append(partial(self._apply_symmetry, symmetry=symmetry))
         
-        return customized_pattern
+        return tuple(pipeline)
     
-    def _apply_horizontal_symmetry(self, pattern):
-        """Apply horizontal symmetry to the pattern"""
-        if 'curves' not in pattern:
-            return pattern
+    def _compile_frozen_pipeline(self, options_key):
+        """Cache target for _compile_pipeline keyed on frozen options"""
+        return self._compile_pipeline(dict(options_key))
+    
+    def get_pipeline(self, customization_options):
+        """Return the compiled steps for the options, reusing cached pipelines"""
+        options_key = _freeze_options(customization_options)
+        if options_key is None:
+            return self._compile_pipeline(customization_options)
+        return self._cached_pipeline(options_key)
+    
+    def apply_customization(self, pattern_data, customization_options):
+        """Apply customization options to a kolam pattern"""
+        pipeline = self.get_pipeline(customization_options)
         
-        new_curves = pattern['curves'].copy()
-        center_y = pattern['dimensions']['height'] / 2
+        # Clone the pattern data so nested dots/curves are never shared with the input
+        customized_pattern = _fast_clone(pattern_data)
         
-        for curve in pattern['curves']:
-            if 'curvePoints' in curve:
-                new_curve = curve.copy()
-                new_curve['curvePoints'] = []
-                for point in curve['curvePoints']:
-                    new_point = point.copy()
-                    new_point['y'] = center_y - (point['y'] - center_y)
-                    new_curve['curvePoints'].append(new_point)
-                new_curves.append(new_curve)
+        # Work on packed point arrays; dicts are only rebuilt on the way out
+        if 'curves' in customized_pattern:
+            customized_pattern['curves'] = [self._pack_points(curve) for curve in customized_pattern['curves']]
         
-        pattern['curves'] = new_curves
-        return pattern
+        for step in pipeline:
+            customized_pattern = step(customized_pattern)
+        
+        if 'curves' in customized_pattern:
+            customized_pattern['curves'] = [self._unpack_points(curve) for curve in customized_pattern['curves']]
+        
+        return customized_pattern
     
-    def _apply_vertical_symmetry(self, pattern):
-        """Apply vertical symmetry to the pattern"""
+    def _apply_affine(self, pattern, m, t):
+        """Append a copy of every curve with its points mapped through (m, t)"""
         if 'curves' not in pattern:
             return pattern
         
-        new_curves = pattern['curves'].copy()
-        center_x = pattern['dimensions']['width'] / 2
-        
-        for curve in pattern['curves']:
-            if 'curvePoints' in curve:
-                new_curve = curve.copy()
-                new_curve['curvePoints'] = []
-                for point in curve['curvePoints']:
-                    new_point = point.copy()
-                    new_point['x'] = center_x - (point['x'] - center_x)
-                    new_curve['curvePoints'].append(new_point)
-                new_curves.append(new_curve)
+        curves = [curve for curve in pattern['curves'] if '_pts' in curve]
+        pts, offsets = _gather_points(curves)
+        pts = _transform_points(pts, m, t)
         
-        pattern['curves'] = new_curves
+        pattern['curves'] = pattern['curves'] + _scatter_points(curves, pts, offsets)
         return pattern
     
-    def _apply_diagonal_symmetry(self, pattern):
-        """Apply diagonal symmetry to the pattern"""
+    def _apply_symmetry(self, pattern, symmetry):
+        """Reflect the pattern across its center line for the given symmetry"""
         if 'curves' not in pattern:
             return pattern
         
-        new_curves = pattern['curves'].copy()
         center_x = pattern['dimensions']['width'] / 2
         center_y = pattern['dimensions']['height'] / 2
-        
-        for curve in pattern['curves']:
-            if 'curvePoints' in curve:
-                new_curve = curve.copy()
-                new_curve['curvePoints'] = []
-                for point in curve['curvePoints']:
-                    new_point = point.copy()
-                    # Reflect across diagonal (swap x and y)
-                    new_point['x'] = center_y - (point['y'] - center_y)
-                    new_point['y'] = center_x - (point['x'] - center_x)
-                    new_curve['curvePoints'].append(new_point)
-                new_curves.append(new_curve)
-        
-        pattern['curves'] = new_curves
-        return pattern
+        return self._apply_affine(pattern, *_reflection(symmetry, center_x, center_y))
+    
+    def _apply_horizontal_symmetry(self, pattern):
+        """Apply horizontal symmetry to the pattern"""
+        return self._apply_symmetry(pattern, 'horizontal')
+    
+    def _apply_vertical_symmetry(self, pattern):
+        """Apply vertical symmetry to the pattern"""
+        return self._apply_symmetry(pattern, 'vertical')
+    
+    def _apply_diagonal_symmetry(self, pattern):
+        """Apply diagonal symmetry to the pattern"""
+        return self._apply_symmetry(pattern, 'diagonal')
     
     def generate_customized_kolam(self, grid_size, theme, customization_options):
         """Generate a kolam with customizations applied"""
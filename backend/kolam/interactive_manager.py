@@ -1,78 +1,227 @@
-import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from .zen_kolam_generator import zen_kolam_generator
+from .customization_manager import _fast_clone
+
+logger = logging.getLogger(__name__)
+
+# History previews are rendered off the request thread
+_preview_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='kolam-preview')
+
+def _log_failed_preview(future):
+    """Log the error of a background preview render"""
+    if future.cancelled():
+        return
+    try:
+        future.result()
+    except Exception:
+        logger.exception("History preview render failed")
+
+class HistoryEntry:
+    """A single step in the pattern history.
+
+    An entry stores either a full `snapshot` of the pattern or a `delta` holding
+    only the top-level keys that changed since the previous entry (plus the keys
+    that were removed). Unchanged values are shared with earlier entries, so the
+    stored patterns must be treated as read-only.
+    
+    The preview image is rendered in the background; `preview_future` holds the
+    pending render and `preview_image` waits for it on first access.
+    """
+    
+    def __init__(self, action_name, timestamp, preview_future, snapshot=None, delta=None, removed_keys=()):
+        self.action_name = action_name
+        self.timestamp = timestamp
+        self.preview_future = preview_future
+        self.snapshot = snapshot
+        self.delta = delta
+        self.removed_keys = removed_keys
+    
+    @property
+    def is_snapshot(self):
+        return self.delta is None
+    
+    @property
+    def preview_image(self):
+        """Base64 preview image, waiting for the background render if needed; None if it failed"""
+        try:
+            return self.preview_future.result()
+        except Exception:
+            return None
+    
+    def cancel_preview(self):
+        """Cancel the preview render if it has not started yet"""
+        self.preview_future.cancel()
+    
+    def to_dict(self, pattern_data):
+        """Return the entry in the public history format"""
+        return {
+            'pattern_data': pattern_data,
+            'action_name': self.action_name,
+            'timestamp': self.timestamp,
+            'preview_image': self.preview_image
+        }
 
 class InteractiveManager:
+    """Undo/redo history and real-time previews for the interactive editor.
+
+    History lives in a fixed-size ring buffer. `_head` and `_tail` are absolute
+    positions of the oldest entry and one past the newest, and `_cur` is the
+    absolute position of the current entry; slots are addressed modulo
+    `max_history_size`.
+    """
+    __slots__ = (
+        'kolam_generator', 'max_history_size', 'snapshot_interval',
+        '_buf', '_head', '_tail', '_cur',
+    )
+    
     def __init__(self):
         self.kolam_generator = zen_kolam_generator
-        self.pattern_history = []
-        self.current_history_index = -1
         self.max_history_size = 20
+        self.snapshot_interval = 5  # Store a full snapshot every N entries
+        self._buf = [None] * self.max_history_size
+        self._head = 0
+        self._tail = 0
+        self._cur = -1
+    
+    @property
+    def current_history_index(self):
+        """Index of the current entry relative to the oldest one"""
+        return self._cur - self._head
+    
+    def _history_length(self):
+        return self._tail - self._head
+    
+    def _entry(self, index):
+        """History entry at `index`, counted from the oldest entry"""
+        return self._buf[(self._head + index) % len(self._buf)]
+    
+    def _snapshot_index(self, index):
+        """Index of the nearest full snapshot at or before `index`"""
+        while not self._entry(index).is_snapshot:
+            index -= 1
+        return index
+    
+    def _reconstruct(self, index):
+        """Rebuild the pattern stored at `index` from its snapshot and deltas"""
+        base = self._snapshot_index(index)
+        pattern = self._entry(base).snapshot
+        if base == index:
+            return pattern
+        
+        pattern = dict(pattern)
+        for position in range(base + 1, index + 1):
+            entry = self._entry(position)
+            pattern.update(entry.delta)
+            for key in entry.removed_keys:
+                pattern.pop(key, None)
+        return pattern
+    
+    def _make_entry(self, pattern_data, action_name, preview_future):
+        """Create a history entry, as a delta against the last entry when possible"""
+        timestamp = datetime.now().isoformat()
+        last = self._history_length() - 1
+        if (last < 0 or not isinstance(pattern_data, dict)
+                or last - self._snapshot_index(last) + 1 >= self.snapshot_interval):
+            return HistoryEntry(action_name, timestamp, preview_future, snapshot=_fast_clone(pattern_data))
+        
+        previous = self._reconstruct(last)
+        if not isinstance(previous, dict):
+            return HistoryEntry(action_name, timestamp, preview_future, snapshot=_fast_clone(pattern_data))
+        
+        delta = {key: _fast_clone(value) for key, value in pattern_data.items()
+                 if key not in previous or previous[key] != value}
+        removed_keys = tuple(key for key in previous if key not in pattern_data)
+        return HistoryEntry(action_name, timestamp, preview_future, delta=delta, removed_keys=removed_keys)
     
     def add_to_history(self, pattern_data, action_name="Pattern Change"):
         """Add a pattern to the history stack"""
+        # The preview renders in the background, so reject patterns it cannot draw up front
+        if not (isinstance(pattern_data, dict) and 'dimensions' in pattern_data and 'curves' in pattern_data):
+            raise ValueError("pattern_data must be a pattern dict with 'dimensions' and 'curves'")
+        
         # Remove any history after current index (for redo functionality)
-        if self.current_history_index < len(self.pattern_history) - 1:
-            self.pattern_history = self.pattern_history[:self.current_history_index + 1]
+        for position in range(self._cur + 1, self._tail):
+            slot = position % len(self._buf)
+            self._buf[slot].cancel_preview()
+            self._buf[slot] = None
+        self._tail = self._cur + 1
         
-        # Add new pattern to history
-        history_entry = {
-            'pattern_data': pattern_data.copy(),
-            'action_name': action_name,
-            'timestamp': datetime.now().isoformat(),
-            'preview_image': self.kolam_generator.generate_kolam_image(pattern_data, (150, 150), include_dots=True)
-        }
+        # Limit history size
+        if self._history_length() >= len(self._buf):
+            self._evict_oldest()
         
-        self.pattern_history.append(history_entry)
-        self.current_history_index = len(self.pattern_history) - 1
+        # Add new pattern to history; the preview renders in the background
+        preview_future = _preview_pool.submit(
+            self.kolam_generator.generate_kolam_image, _fast_clone(pattern_data), (150, 150), True
+        )
+        preview_future.add_done_callback(_log_failed_preview)
+        history_entry = self._make_entry(pattern_data, action_name, preview_future)
         
-        # Limit history size
-        if len(self.pattern_history) > self.max_history_size:
-            self.pattern_history.pop(0)
-            self.current_history_index -= 1
+        self._buf[self._tail % len(self._buf)] = history_entry
+        self._cur = self._tail
+        self._tail += 1
+    
+    def _evict_oldest(self):
+        """Drop the oldest history entry"""
+        # The next entry becomes the base snapshot for its successors
+        if self._history_length() > 1 and not self._entry(1).is_snapshot:
+            successor = self._entry(1)
+            successor.snapshot = self._reconstruct(1)
+            successor.delta = None
+            successor.removed_keys = ()
+        slot = self._head % len(self._buf)
+        self._buf[slot].cancel_preview()
+        self._buf[slot] = None
+        self._head += 1
     
     def undo(self):
         """Undo the last action"""
-        if self.current_history_index > 0:
-            self.current_history_index -= 1
-            return self.pattern_history[self.current_history_index]['pattern_data']
+        if self.can_undo():
+            self._cur -= 1
+            return self._reconstruct(self.current_history_index)
         return None
     
     def redo(self):
         """Redo the last undone action"""
-        if self.current_history_index < len(self.pattern_history) - 1:
-            self.current_history_index += 1
-            return self.pattern_history[self.current_history_index]['pattern_data']
+        if self.can_redo():
+            self._cur += 1
+            return self._reconstruct(self.current_history_index)
         return None
     
     def get_current_pattern(self):
         """Get the current pattern"""
-        if 0 <= self.current_history_index < len(self.pattern_history):
-            return self.pattern_history[self.current_history_index]['pattern_data']
+        if 0 <= self.current_history_index < self._history_length():
+            return self._reconstruct(self.current_history_index)
         return None
     
     def get_history(self):
         """Get the full history"""
-        return self.pattern_history
+        return [self._entry(index).to_dict(self._reconstruct(index)) for index in range(self._history_length())]
     
     def get_history_entry(self, index):
         """Get a specific history entry"""
-        if 0 <= index < len(self.pattern_history):
-            return self.pattern_history[index]
+        if 0 <= index < self._history_length():
+            return self._entry(index).to_dict(self._reconstruct(index))
         return None
     
     def can_undo(self):
         """Check if undo is possible"""
-        return self.current_history_index > 0
+        return self._cur > self._head
     
     def can_redo(self):
         """Check if redo is possible"""
-        return self.current_history_index < len(self.pattern_history) - 1
+        return self._cur < self._tail - 1
     
     def clear_history(self):
         """Clear the history"""
-        self.pattern_history = []
-        self.current_history_index = -1
+        for index in range(self._history_length()):
+            self._entry(index).cancel_preview()
+        self._buf = [None] * self.max_history_size
+        self._head = 0
+        self._tail = 0
+        self._cur = -1
     
     def generate_preview(self, pattern_data, size=(200, 200), theme='traditional'):
         """Generate a preview image for the pattern"""
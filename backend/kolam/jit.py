@@ -0,0 +1,21 @@
+"""
+Optional Numba support for the numeric kernels in the kolam app.
+
+Numba is an optional accelerator: when it is not installed `njit` becomes a
+no-op decorator and `prange` falls back to `range`, so every kernel still runs
+as plain Python. Callers that have a faster NumPy formulation can check
+`NUMBA_AVAILABLE` and pick that path instead.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -3,96 +3,60 @@ import numpy as np
 from PIL import Image
 import io
 import math
-import base64
 import time
+from collections import defaultdict
+from django.conf import settings
 
-def _trace_path(skeleton, start_point, visited):
-    """An improved helper function to trace a single path from a starting point."""
-    path = [start_point]
-    visited[start_point[1], start_point[0]] = 255
-    
-    # Directions to check for neighboring pixels (8-connectivity)
-    directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-    
-    current_point = start_point
-    max_path_length = 1000  # Prevent infinite loops
-    path_length = 0
-    
-    while path_length < max_path_length:
-        found_next = False
-        best_next = None
-        min_distance = float('inf')
-        
-        # Look for the best next point (closest to current direction)
-        for dx, dy in directions:
-            next_x, next_y = current_point[0] + dx, current_point[1] + dy
-            
-            # Check bounds
-            if 0 <= next_y < skeleton.shape[0] and 0 <= next_x < skeleton.shape[1]:
-                if skeleton[next_y, next_x] == 255 and visited[next_y, next_x] == 0:
-                    # Calculate distance from current point
-                    distance = np.sqrt(dx*dx + dy*dy)
-                    if distance < min_distance:
-                        min_distance = distance
-                        best_next = (next_x, next_y)
-                        found_next = True
-        
-        if found_next and best_next:
-            current_point = best_next
-            path.append(current_point)
-            visited[current_point[1], current_point[0]] = 255
-            path_length += 1
-        else:
-            break
-            
-    return path
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
-def _find_paths_from_skeleton(skeleton):
-    """
-    Traces all the distinct line paths from a skeleton image with improved accuracy.
-    """
-    paths = []
-    # Create a mask to keep track of visited pixels
-    visited = np.zeros(skeleton.shape, dtype=np.uint8)
-    
-    # Find all white pixels (potential path points)
-    white_pixels = np.argwhere(skeleton == 255)
-    
-    # Sort pixels by their distance from center for better path ordering
-    center_y, center_x = skeleton.shape[0] // 2, skeleton.shape[1] // 2
-    white_pixels = sorted(white_pixels, key=lambda p: np.sqrt((p[0] - center_y)**2 + (p[1] - center_x)**2))
-    
-    for pixel in white_pixels:
-        # The pixel coordinates are returned as (row, col) which is (y, x)
-        y, x = pixel
-        if visited[y, x] == 0:
-            # If we haven't visited this pixel, it's the start of a new path
-            new_path = _trace_path(skeleton, (x, y), visited)
-            if len(new_path) > 5:  # Reduced minimum length for better coverage
-                # Smooth the path for better accuracy
-                smoothed_path = _smooth_path(new_path)
-                paths.append(smoothed_path)
-                
-    return paths
+try:
+    from skimage.morphology import skeletonize
+except ImportError:
+    skeletonize = None
 
-def _smooth_path(path, window_size=3):
-    """
-    Smooth a path by applying a moving average filter.
-    """
-    if len(path) < window_size:
-        return path
-    
-    smoothed = []
-    for i in range(len(path)):
-        start_idx = max(0, i - window_size // 2)
-        end_idx = min(len(path), i + window_size // 2 + 1)
-        
-        window = path[start_idx:end_idx]
-        avg_x = sum(point[0] for point in window) / len(window)
-        avg_y = sum(point[1] for point in window) / len(window)
-        smoothed.append((int(avg_x), int(avg_y)))
-    
-    return smoothed
+class _SpatialHash:
+    """Fixed-size grid of cells for fast near-duplicate point lookups."""
+    
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+    
+    def add(self, x, y, item=None):
+        self.cells[(x // self.cell_size, y // self.cell_size)].append((x, y, item))
+    
+    def items_within(self, x, y, radius):
+        """Yield the items of all stored points closer than `radius` to (x, y)."""
+        reach = int(-(-radius // self.cell_size))
+        cell_x, cell_y = x // self.cell_size, y // self.cell_size
+        radius_sq = radius * radius
+        for gx in range(cell_x - reach, cell_x + reach + 1):
+            for gy in range(cell_y - reach, cell_y + reach + 1):
+                for px, py, item in self.cells.get((gx, gy), ()):
+                    if (px - x) * (px - x) + (py - y) * (py - y) < radius_sq:
+                        yield item
+    
+    def has_point_within(self, x, y, radius):
+        """Check if any stored point lies closer than `radius` to (x, y)."""
+        return any(True for _ in self.items_within(x, y, radius))
+
+# Morphology structuring elements shared by every analysis
+_KERNEL_CLOSE = np.ones((2,2), np.uint8)
+_KERNEL_OPEN = np.ones((1,1), np.uint8)
+_KERNEL_CROSS = cv2.getStructuringElement(cv2.MORPH_CROSS, (3,3))
+
+# Dots closer than these radii to an existing dot are treated as duplicates
+_HOUGH_DEDUP_RADIUS = 8
+_CONTOUR_DEDUP_RADIUS = 12
+
+# Accumulator thresholds swept, strictest first, when the detected dots do not fill a grid
+_HOUGH_FALLBACK_PARAM2 = (30, 25, 20, 15, 10)
+_HOUGH_FALLBACK_MAX_CIRCLES = 600
+
+# The processed image is only a preview, so favour encode speed over size
+_PNG_ENCODE_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
 
 def _estimate_grid_from_dots(dot_coords, tolerance_factor=0.3):
     """
@@ -104,13 +68,10 @@ def _estimate_grid_from_dots(dot_coords, tolerance_factor=0.3):
     coords = np.array(dot_coords)
     
     # Calculate pairwise distances to estimate grid spacing
-    distances = []
-    for i in range(len(coords)):
-        for j in range(i+1, len(coords)):
-            dist = np.sqrt((coords[i][0] - coords[j][0])**2 + (coords[i][1] - coords[j][1])**2)
-            distances.append(dist)
+    diff = coords[:, None, :] - coords[None, :, :]
+    distances = np.sqrt((diff ** 2).sum(axis=-1))[np.triu_indices(len(coords), 1)]
     
-    if not distances:
+    if distances.size == 0:
         return 3
     
     # Use median distance as base grid spacing
@@ -158,16 +119,73 @@ def _estimate_grid_from_dots(dot_coords, tolerance_factor=0.3):
 
     return grid_size
 
+def _cuda_available():
+    """Check whether OpenCV was built with CUDA and a device is present."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+_CUDA_AVAILABLE = _cuda_available()
+
+# Enable OpenCV optimizations (do not force single-thread) once per process
+cv2.setUseOptimized(True)
+
+def _opencl_enabled():
+    """
+    Whether preprocessing runs through OpenCL UMats.
+    Opt-in with settings.KOLAM_USE_OPENCL, since turning on OpenCL changes
+    OpenCV state for the whole process.
+    """
+    if not getattr(settings, 'KOLAM_USE_OPENCL', False):
+        return False
+    cv2.ocl.setUseOpenCL(True)
+    return cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
+def _enhance_gray(gray, max_dim):
+    """
+    Contrast enhancement and edge-preserving denoising of the gray image.
+    Runs on the GPU when CUDA is available, otherwise through OpenCL UMats when
+    enabled and present, and on the CPU as a last resort.
+    """
+    if _CUDA_AVAILABLE and max_dim <= 2000:
+        try:
+            gpu_image = cv2.cuda_GpuMat()
+            gpu_image.upload(gray)
+            clahe = cv2.cuda.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+            gpu_image = clahe.apply(gpu_image, cv2.cuda_Stream.Null())
+            gpu_image = cv2.cuda.bilateralFilter(gpu_image, 9, 75, 75)
+            return gpu_image.download()
+        except cv2.error:
+            pass
+    
+    # With OpenCL the whole chain stays on the device and is read back once
+    source = cv2.UMat(gray) if _opencl_enabled() else gray
+    
+    # Multiple enhancement techniques
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+    enhanced = clahe.apply(source)
+    
+    # Bilateral filter to preserve edges while reducing noise
+    # Use bilateral for medium images; Gaussian for very large ones (faster)
+    if max_dim > 2000:
+        filtered = cv2.GaussianBlur(enhanced, (3,3), 0)
+    else:
+        filtered = cv2.bilateralFilter(enhanced, 9, 75, 75)
+    
+    return filtered.get() if isinstance(filtered, cv2.UMat) else filtered
+
+def _build_pyramid(image, levels=2):
+    """Gaussian pyramid of `image`, full resolution first."""
+    pyramid = [image]
+    for _ in range(levels):
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
 def analyze_kolam_image(image_file_bytes):
     """
     Ultra-advanced kolam analysis with vector-based pattern recognition for maximum accuracy.
     """
-    # Enable OpenCV optimizations (do not force single-thread)
-    try:
-        cv2.setUseOptimized(True)
-    except Exception:
-        pass
-
     pil_image = Image.open(io.BytesIO(image_file_bytes)).convert('RGB')
     open_cv_image = np.array(pil_image)
     open_cv_image = open_cv_image[:, :, ::-1].copy()
@@ -183,22 +201,14 @@ def analyze_kolam_image(image_file_bytes):
     # === 1. ULTRA-ADVANCED IMAGE PREPROCESSING ===
     gray = cv2.cvtColor(process_image, cv2.COLOR_BGR2GRAY)
     
-    # Multiple enhancement techniques
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-    enhanced = clahe.apply(gray)
-    
-    # Bilateral filter to preserve edges while reducing noise
-    # Use bilateral for medium images; Gaussian for very large ones (faster)
-    if max_dim > 2000:
-        filtered = cv2.GaussianBlur(enhanced, (3,3), 0)
-    else:
-        filtered = cv2.bilateralFilter(enhanced, 9, 75, 75)
+    filtered = _enhance_gray(gray, max_dim)
+    pyramid = _build_pyramid(filtered)
     
     overall_start = time.time()
     overall_budget_sec = 55.0
 
     # === 2. ULTRA-SOPHISTICATED DOT DETECTION ===
-    dot_coords = _detect_dots_ultra_advanced(filtered, process_image)
+    dot_coords = _detect_dots_ultra_advanced(filtered, process_image, pyramid)
     
     # === 3. VECTOR-BASED PATTERN TRACING (with fallback for hand-drawn) ===
     traced_paths = []
@@ -212,110 +222,150 @@ def analyze_kolam_image(image_file_bytes):
     grid_size = _estimate_grid_from_dots(dot_coords)
     
     # === 5. RETURN RESULTS ===
-    _, buffer = cv2.imencode('.png', process_image)
+    _, buffer = cv2.imencode('.png', process_image, _PNG_ENCODE_PARAMS)
     processed_image_b64 = base64.b64encode(buffer).decode('utf-8')
 
     return grid_size, dot_coords, traced_paths, processed_image_b64
 
-def _detect_dots_ultra_advanced(gray_image, output_image):
+def _is_filled_dot(mask, x, y, r):
+    """Check that a Hough circle sits on a filled blob of the foreground mask, not on an outline."""
+    half = max(1, int(r * 0.5))
+    patch = mask[max(0, y - half):y + half + 1, max(0, x - half):x + half + 1]
+    return patch.size > 0 and patch.mean() > 0.7 * 255
+
+def _add_hough_dots(circles, scale, mask, dot_coords, dot_index, output_image):
+    """Add the filled, not yet detected circles of a HoughCircles result."""
+    if circles is None:
+        return
+    # Scale back coordinates
+    circles = (np.round(circles.reshape(-1, 3)) / scale).astype("int")
+    for (x, y, r) in circles.tolist():
+        # Early exit if enough dots found
+        if len(dot_coords) >= 150:
+            break
+        # Check if this dot is not already detected
+        if not dot_index.has_point_within(x, y, _HOUGH_DEDUP_RADIUS) and _is_filled_dot(mask, x, y, r):
+            dot_coords.append((x, y))
+            dot_index.add(x, y)
+            cv2.circle(output_image, (x, y), r, (0, 255, 0), 2)
+
+def _dots_form_grid(dot_coords):
+    """Whether the detected dots fill the square grid estimated from them."""
+    if len(dot_coords) < 4:
+        return False
+    grid_size = _estimate_grid_from_dots(dot_coords)
+    return len(dot_coords) >= grid_size * grid_size
+
+def _detect_dots_ultra_advanced(gray_image, output_image, pyramid=None):
     """Ultra-advanced dot detection with maximum accuracy."""
     dot_coords = []
+    dot_index = _SpatialHash(_HOUGH_DEDUP_RADIUS)
     start_time = time.time()
     time_budget_sec = 8.0  # keep dot detection bounded
     
-    # Method 1: Multi-scale HoughCircles detection
-    for scale in [0.8, 1.0, 1.2]:
-        if time.time() - start_time > time_budget_sec:
+    # Foreground mask of dots and strokes; on a light background Otsu marks
+    # the paper instead, so flip it
+    _, thresh = cv2.threshold(gray_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if cv2.countNonZero(thresh) > thresh.size // 2:
+        thresh = cv2.bitwise_not(thresh)
+    
+    # Method 1: HoughCircles (gradient-alt variant) over a small image pyramid
+    if pyramid is None:
+        pyramid = _build_pyramid(gray_image)
+    
+    for level, level_image in enumerate(pyramid):
+        if time.time() - start_time > time_budget_sec or len(dot_coords) >= 150:
             break
-        scaled_image = cv2.resize(gray_image, None, fx=scale, fy=scale)
-        
-        for min_dist in [10, 15, 20, 25]:
-            if time.time() - start_time > time_budget_sec:
-                break
-            for param2 in [10, 15, 20, 25, 30]:
-                if time.time() - start_time > time_budget_sec:
-                    break
-                circles = cv2.HoughCircles(
-                    scaled_image, 
-                    cv2.HOUGH_GRADIENT, 
-                    dp=1, 
-                    minDist=min_dist,
-                    param1=30,
-                    param2=param2,
-                    minRadius=2, 
-                    maxRadius=40
-                )
-                
-                if circles is not None:
-                    circles = np.round(circles[0, :]).astype("int")
-                    for (x, y, r) in circles:
-                        # Scale back coordinates
-                        x = int(x / scale)
-                        y = int(y / scale)
-                        r = int(r / scale)
-                        
-                        # Check if this dot is not already detected
-                        if not any(np.sqrt((x-cx)**2 + (y-cy)**2) < 8 for cx, cy in dot_coords):
-                            dot_coords.append((x, y))
-                            cv2.circle(output_image, (x, y), r, (0, 255, 0), 2)
-                        # Early exit if enough dots found
-                        if len(dot_coords) >= 150:
-                            break
-                    if len(dot_coords) >= 150:
-                        break
-            if len(dot_coords) >= 150:
-                break
+        scale = 0.5 ** level
+        circles = cv2.HoughCircles(
+            level_image,
+            cv2.HOUGH_GRADIENT_ALT,
+            dp=1.5,
+            minDist=15 * scale,
+            param1=300,
+            param2=0.85,
+            minRadius=2,
+            maxRadius=40
+        )
+        _add_hough_dots(circles, scale, thresh, dot_coords, dot_index, output_image)
     
     # Method 2: Advanced contour-based detection
     if time.time() - start_time < time_budget_sec:
-        _, thresh = cv2.threshold(gray_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # RETR_LIST so dots enclosed by strokes are found too
+        contours, _ = cv2.findContours(thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # Filter on area and circularity for all contours at once; only the
+        # survivors pay for moments
+        areas = np.fromiter((cv2.contourArea(contour) for contour in contours), np.float64, len(contours))
+        perimeters = np.fromiter((cv2.arcLength(contour, True) for contour in contours), np.float64, len(contours))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            circularity = 4 * np.pi * areas / (perimeters * perimeters)
+        # Wider area range for dot detection, more lenient circularity check
+        keep = (areas > 10) & (areas < 800) & (perimeters > 0) & (circularity > 0.6)
         
-        for contour in contours:
+        for index in np.flatnonzero(keep).tolist():
             if time.time() - start_time > time_budget_sec:
                 break
-            area = cv2.contourArea(contour)
-            if 10 < area < 800:  # Wider range for dot detection
-                # Check if contour is roughly circular
-                perimeter = cv2.arcLength(contour, True)
-                if perimeter > 0:
-                    circularity = 4 * np.pi * area / (perimeter * perimeter)
-                    if circularity > 0.6:  # More lenient circularity check
-                        M = cv2.moments(contour)
-                        if M["m00"] != 0:
-                            cx = int(M["m10"] / M["m00"])
-                            cy = int(M["m01"] / M["m00"])
-                            # Check if this dot is not already detected
-                            if not any(np.sqrt((cx-x)**2 + (cy-y)**2) < 12 for x, y in dot_coords):
-                                dot_coords.append((cx, cy))
-                                cv2.circle(output_image, (cx, cy), 4, (0, 255, 0), 2)
+            M = cv2.moments(contours[index])
+            if M["m00"] != 0:
+                cx = int(M["m10"] / M["m00"])
+                cy = int(M["m01"] / M["m00"])
+                # Check if this dot is not already detected
+                if not dot_index.has_point_within(cx, cy, _CONTOUR_DEDUP_RADIUS) and _is_filled_dot(thresh, cx, cy, 2):
+                    dot_coords.append((cx, cy))
+                    dot_index.add(cx, cy)
+                    cv2.circle(output_image, (cx, cy), 4, (0, 255, 0), 2)
+    
+    # Method 3: when the dots found so far do not fill a grid, sweep the
+    # classic gradient method from strict to loose accumulator thresholds.
+    # Large dots are left to the passes above, which keeps each call cheap.
+    for param2 in _HOUGH_FALLBACK_PARAM2:
+        if (_dots_form_grid(dot_coords) or len(dot_coords) >= 150
+                or time.time() - start_time > time_budget_sec):
+            break
+        circles = cv2.HoughCircles(
+            gray_image,
+            cv2.HOUGH_GRADIENT,
+            dp=1,
+            minDist=10,
+            param1=30,
+            param2=param2,
+            minRadius=2,
+            maxRadius=20
+        )
+        _add_hough_dots(circles, 1.0, thresh, dot_coords, dot_index, output_image)
+        # A flood of circles means noise; looser thresholds would only add more
+        if circles is not None and circles.shape[1] > _HOUGH_FALLBACK_MAX_CIRCLES:
+            break
     
     return dot_coords
 
+# Skeletons at least this large are line-searched at half resolution
+_HALF_RES_MIN_DIM = 800
+
+def _half_res_skeleton(skeleton):
+    """Downscale a binary skeleton 2x with max-pooling so thin lines stay connected."""
+    height, width = skeleton.shape[0] // 2 * 2, skeleton.shape[1] // 2 * 2
+    return np.ascontiguousarray(skeleton[:height, :width].reshape(height // 2, 2, width // 2, 2).max(axis=(1, 3)))
+
 def _trace_kolam_vector_based(gray_image, output_image, dot_coords):
     """Vector-based kolam pattern tracing for maximum accuracy."""
     traced_paths = []
     start_time = time.time()
     time_budget_sec = 20.0
     
-    # Create binary image with multiple thresholding methods
-    _, binary1 = cv2.threshold(gray_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    binary2 = cv2.adaptiveThreshold(gray_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-    
-    # Combine binary images
-    binary = cv2.bitwise_or(binary1, binary2)
-    
-    # Invert so lines are white
-    binary = cv2.bitwise_not(binary)
+    # Create binary image with multiple thresholding methods, inverted so lines are white.
+    # NOT(otsu OR adaptive) == NOT(otsu) AND NOT(adaptive), so both thresholds are taken
+    # inverted and combined in a single pass
+    _, binary1 = cv2.threshold(gray_image, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    binary2 = cv2.adaptiveThreshold(gray_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+    binary = cv2.bitwise_and(binary1, binary2, dst=binary1)
     
     # Advanced morphological operations
-    kernel_close = np.ones((2,2), np.uint8)
-    kernel_open = np.ones((1,1), np.uint8)
-    
     # Close gaps in lines
-    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel_close)
+    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, _KERNEL_CLOSE)
     # Remove noise
-    cleaned = cv2.morphologyEx(closed, cv2.MORPH_OPEN, kernel_open)
+    cleaned = cv2.morphologyEx(closed, cv2.MORPH_OPEN, _KERNEL_OPEN)
     
     # Crop to active region to reduce processing area
     nz = cv2.findNonZero(cleaned)
@@ -332,16 +382,19 @@ def _trace_kolam_vector_based(gray_image, output_image, dot_coords):
         roi = cleaned[y0:y1, x0:x1]
         offset_x, offset_y = x0, y0
     
-    # Skeletonization on ROI (with safe fallback)
+    # Skeletonization on ROI (ximgproc thinning, then scikit-image, then a morphological fallback)
     try:
         skeleton = cv2.ximgproc.thinning(roi)
     except Exception:
+        skeleton = None
+    if skeleton is None and skeletonize is not None:
+        skeleton = skeletonize(roi > 0).astype(np.uint8) * 255
+    if skeleton is None:
         skel = np.zeros_like(roi)
-        elem = cv2.getStructuringElement(cv2.MORPH_CROSS, (3,3))
         eroded = np.copy(roi)
         while True:
-            eroded = cv2.erode(eroded, elem)
-            opened = cv2.morphologyEx(eroded, cv2.MORPH_OPEN, elem)
+            eroded = cv2.erode(eroded, _KERNEL_CROSS)
+            opened = cv2.morphologyEx(eroded, cv2.MORPH_OPEN, _KERNEL_CROSS)
             temp = cv2.subtract(eroded, opened)
             skel = cv2.bitwise_or(skel, temp)
             if cv2.countNonZero(eroded) == 0 or (time.time() - start_time) > time_budget_sec:
@@ -361,28 +414,31 @@ def _trace_kolam_vector_based(gray_image, output_image, dot_coords):
             approx = cv2.approxPolyDP(contour, epsilon, True)
             
             # Convert to path format
-            path = [(point[0][0] + offset_x, point[0][1] + offset_y) for point in approx]
+            path = approx[:, 0, :] + np.array([offset_x, offset_y], dtype=np.int32)
             
             if len(path) > 1:
                 # No smoothing - preserve all details
                 traced_paths.append(path)
                 
                 # Draw the path
-                for i in range(len(path) - 1):
-                    cv2.line(output_image, path[i], path[i+1], (255, 0, 0), 1)
+                cv2.polylines(output_image, [path], False, (255, 0, 0), 1)
     
     # Also detect straight lines (only if time allows)
+    # Large skeletons are searched at half resolution, which quarters the accumulator work
     lines = None
+    line_scale = 1
     if (time.time() - start_time) < time_budget_sec * 0.8:
-        lines = cv2.HoughLinesP(skeleton, 1, np.pi/180, threshold=10, minLineLength=5, maxLineGap=2)
+        if max(skeleton.shape) >= _HALF_RES_MIN_DIM:
+            line_scale = 2
+            lines = cv2.HoughLinesP(_half_res_skeleton(skeleton), 1, np.pi/180, threshold=5, minLineLength=3, maxLineGap=1)
+        else:
+            lines = cv2.HoughLinesP(skeleton, 1, np.pi/180, threshold=10, minLineLength=5, maxLineGap=2)
     
     if lines is not None:
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            x1 += offset_x; x2 += offset_x; y1 += offset_y; y2 += offset_y
-            path = [(x1, y1), (x2, y2)]
+        segments = lines.reshape(-1, 2, 2) * line_scale + np.array([offset_x, offset_y], dtype=np.int32)
+        for path in segments:
             traced_paths.append(path)
-            cv2.line(output_image, (x1, y1), (x2, y2), (255, 0, 0), 1)
+            cv2.line(output_image, tuple(path[0].tolist()), tuple(path[1].tolist()), (255, 0, 0), 1)
     
     # Connect nearby endpoints to create continuous paths
     traced_paths = _connect_nearby_paths(traced_paths)
@@ -394,6 +450,13 @@ def _connect_nearby_paths(paths, threshold=5):
     if len(paths) < 2:
         return paths
     
+    # Index every path by its two endpoints so joins are found without a full scan
+    endpoint_index = _SpatialHash(max(1, int(math.ceil(threshold))))
+    for j, path in enumerate(paths):
+        if len(path) > 0:
+            for x, y in (path[0], path[-1]):
+                endpoint_index.add(int(x), int(y), j)
+    
     connected_paths = []
     used_paths = set()
     
@@ -404,212 +467,46 @@ def _connect_nearby_paths(paths, threshold=5):
         current_path = path1[:]
         used_paths.add(i)
         
-        # Try to connect with other paths
-        connected = True
-        while connected:
-            connected = False
-            for j, path2 in enumerate(paths):
-                if j in used_paths:
-                    continue
-                
-                # Check if paths can be connected
-                if _can_connect_paths(current_path, path2, threshold):
-                    current_path = _connect_paths(current_path, path2, threshold)
-                    used_paths.add(j)
-                    connected = True
-                    break
+        # Keep joining the first unused path with an endpoint near either end
+        while len(current_path) > 0:
+            candidates = [
+                j
+                for x, y in (current_path[0], current_path[-1])
+                for j in endpoint_index.items_within(int(x), int(y), threshold)
+                if j not in used_paths
+            ]
+            if not candidates:
+                break
+            
+            j = min(candidates)
+            current_path = _connect_paths(current_path, paths[j], threshold)
+            used_paths.add(j)
         
         connected_paths.append(current_path)
     
     return connected_paths
 
-def _can_connect_paths(path1, path2, threshold):
-    """Check if two paths can be connected."""
-    if not path1 or not path2:
-        return False
-    
-    # Check all combinations of endpoints
-    endpoints1 = [path1[0], path1[-1]]
-    endpoints2 = [path2[0], path2[-1]]
-    
-    for ep1 in endpoints1:
-        for ep2 in endpoints2:
-            dist = np.sqrt((ep1[0] - ep2[0])**2 + (ep1[1] - ep2[1])**2)
-            if dist < threshold:
-                return True
-    
-    return False
+def _endpoint_distances_sq(path1, path2):
+    """Squared distances for the endpoint pairings start-start, start-end, end-start, end-end."""
+    a = np.array([path1[0], path1[0], path1[-1], path1[-1]], dtype=np.int64)
+    b = np.array([path2[0], path2[-1], path2[0], path2[-1]], dtype=np.int64)
+    return ((a - b) ** 2).sum(axis=1)
 
 def _connect_paths(path1, path2, threshold):
     """Connect two paths at their closest endpoints."""
-    if not path1 or not path2:
-        return path1 or path2
-    
-    endpoints1 = [path1[0], path1[-1]]
-    endpoints2 = [path2[0], path2[-1]]
-    
-    min_dist = float('inf')
-    best_connection = None
-    
-    for i, ep1 in enumerate(endpoints1):
-        for j, ep2 in enumerate(endpoints2):
-            dist = np.sqrt((ep1[0] - ep2[0])**2 + (ep1[1] - ep2[1])**2)
-            if dist < min_dist and dist < threshold:
-                min_dist = dist
-                best_connection = (i, j)
+    if len(path1) == 0 or len(path2) == 0:
+        return path1 if len(path1) > 0 else path2
     
-    if best_connection is None:
+    dist_sq = _endpoint_distances_sq(path1, path2)
+    best = int(dist_sq.argmin())
+    if dist_sq[best] >= threshold * threshold:
         return path1
     
-    i, j = best_connection
-    
-    if i == 0 and j == 0:  # Connect start to start
-        return path2[::-1] + path1
-    elif i == 0 and j == 1:  # Connect start to end
-        return path2 + path1
-    elif i == 1 and j == 0:  # Connect end to start
-        return path1 + path2
+    if best == 0:  # Connect start to start
+        return np.concatenate([path2[::-1], path1], axis=0)
+    elif best == 1:  # Connect start to end
+        return np.concatenate([path2, path1], axis=0)
+    elif best == 2:  # Connect end to start
+        return np.concatenate([path1, path2], axis=0)
     else:  # Connect end to end
-        return path1 + path2[::-1]
-
-def _smooth_path_minimal(path, window_size=3):
-    """Minimal smoothing that preserves intricate details."""
-    if len(path) < window_size:
-        return path
-    
-    smoothed = []
-    for i in range(len(path)):
-        start_idx = max(0, i - window_size // 2)
-        end_idx = min(len(path), i + window_size // 2 + 1)
-        
-        window = path[start_idx:end_idx]
-        avg_x = sum(point[0] for point in window) / len(window)
-        avg_y = sum(point[1] for point in window) / len(window)
-        smoothed.append((int(avg_x), int(avg_y)))
-    
-    return smoothed
-
-def _smooth_path_advanced(path, window_size=5):
-    """Advanced path smoothing that preserves important features."""
-    if len(path) < window_size:
-        return path
-    
-    smoothed = []
-    for i in range(len(path)):
-        start_idx = max(0, i - window_size // 2)
-        end_idx = min(len(path), i + window_size // 2 + 1)
-        
-        window = path[start_idx:end_idx]
-        avg_x = sum(point[0] for point in window) / len(window)
-        avg_y = sum(point[1] for point in window) / len(window)
-        smoothed.append((int(avg_x), int(avg_y)))
-    
-    return smoothed
-
-def _create_paths_between_dots(binary_image, dot_coords):
-    """Create paths that connect dots in the kolam pattern."""
-    paths = []
-    
-    if len(dot_coords) < 2:
-        return paths
-    
-    # For each pair of dots, check if there's a line connecting them
-    for i, dot1 in enumerate(dot_coords):
-        for j, dot2 in enumerate(dot_coords[i+1:], i+1):
-            # Check if there's a path between these dots
-            path = _find_path_between_points(binary_image, dot1, dot2)
-            if path and len(path) > 2:
-                paths.append(path)
-    
-    return paths
-
-def _find_path_between_points(binary_image, start, end):
-    """Find a path between two points in the binary image."""
-    # Use a simple line sampling approach
-    x1, y1 = start
-    x2, y2 = end
-    
-    # Sample points along the line
-    num_samples = max(10, int(np.sqrt((x2-x1)**2 + (y2-y1)**2) / 5))
-    path = []
-    
-    for i in range(num_samples + 1):
-        t = i / num_samples
-        x = int(x1 + t * (x2 - x1))
-        y = int(y1 + t * (y2 - y1))
-        
-        # Check if this point is on a line in the binary image
-        if (0 <= x < binary_image.shape[1] and 0 <= y < binary_image.shape[0] and 
-            binary_image[y, x] > 0):
-            path.append((x, y))
-    
-    return path if len(path) > 2 else None
-
-def _create_paths_from_segments(line_segments):
-    """Create continuous paths from line segments."""
-    if not line_segments:
-        return []
-    
-    paths = []
-    used_segments = set()
-    
-    for i, segment in enumerate(line_segments):
-        if i in used_segments:
-            continue
-            
-        # Start a new path
-        path = [segment[0], segment[1]]
-        used_segments.add(i)
-        
-        # Try to extend the path by finding connected segments
-        extended = True
-        while extended:
-            extended = False
-            for j, other_segment in enumerate(line_segments):
-                if j in used_segments:
-                    continue
-                
-                # Check if segments can be connected
-                if _can_connect_segments(path, other_segment):
-                    # Add the other segment to the path
-                    if _should_append_segment(path, other_segment):
-                        path.append(other_segment[1])
-                    else:
-                        path.insert(0, other_segment[0])
-                    used_segments.add(j)
-                    extended = True
-                    break
-        
-        if len(path) > 2:
-            paths.append(path)
-    
-    return paths
-
-def _can_connect_segments(path, segment):
-    """Check if a segment can be connected to a path."""
-    if not path:
-        return False
-    
-    last_point = path[-1]
-    first_point = path[0]
-    
-    # Check if segment endpoints are close to path endpoints
-    threshold = 10
-    return (np.sqrt((last_point[0] - segment[0][0])**2 + (last_point[1] - segment[0][1])**2) < threshold or
-            np.sqrt((last_point[0] - segment[1][0])**2 + (last_point[1] - segment[1][1])**2) < threshold or
-            np.sqrt((first_point[0] - segment[0][0])**2 + (first_point[1] - segment[0][1])**2) < threshold or
-            np.sqrt((first_point[0] - segment[1][0])**2 + (first_point[1] - segment[1][1])**2) < threshold)
-
-def _should_append_segment(path, segment):
-    """Determine if segment should be appended to the end of the path."""
-    if not path:
-        return True
-    
-    last_point = path[-1]
-    threshold = 10
-    
-    # Check which endpoint of segment is closer to the last point of path
-    dist_to_start = np.sqrt((last_point[0] - segment[0][0])**2 + (last_point[1] - segment[0][1])**2)
-    dist_to_end = np.sqrt((last_point[0] - segment[1][0])**2 + (last_point[1] - segment[1][1])**2)
-    
-    return dist_to_start < dist_to_end
+        return np.concatenate([path1, path2[::-1]], axis=0)
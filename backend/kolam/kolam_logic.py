@@ -1,214 +1,204 @@
 from PIL import Image, ImageDraw
 import io
-import base64
 import numpy as np
+from .jit import njit, prange, NUMBA_AVAILABLE
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Theme color definitions
+_THEME_COLORS = {
+    'traditional': {'background': '#ffffff', 'stroke': '#000000'},
+    'colorful': {'background': '#ffffff', 'stroke': '#ff6b6b'},
+    'golden': {'background': '#fff8e1', 'stroke': '#ff8f00'},
+    'ocean': {'background': '#e3f2fd', 'stroke': '#1976d2'},
+    'sunset': {'background': '#fce4ec', 'stroke': '#e91e63'},
+    'forest': {'background': '#f1f8e9', 'stroke': '#388e3c'}
+}
+
+@njit(parallel=True, cache=True)
+def _transform_paths_kernel(points, offsets, orig_min, orig_size, dest_min, dest_size, lo, hi, out):
+    """Normalise packed path points, map them onto the grid and clamp to [lo, hi]"""
+    for i in prange(len(offsets) - 1):
+        for j in range(offsets[i], offsets[i + 1]):
+            for axis in range(2):
+                norm = (points[j, axis] - orig_min[axis]) / orig_size[axis]
+                value = dest_min[axis] + norm * dest_size[axis]
+                out[j, axis] = min(max(value, lo[axis]), hi[axis])
+
+def _transform_paths(paths, orig_min, orig_size, dest_min, dest_size, lo=None, hi=None):
+    """
+    Map every path from the source dot bounds onto the destination grid in one pass.
+    All points are packed into a single buffer; the returned arrays are views into it.
+    """
+    lengths = [len(path) for path in paths]
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    points = np.concatenate([np.asarray(path, dtype=np.float64).reshape(-1, 2) for path in paths])
+    
+    if NUMBA_AVAILABLE:
+        out = np.empty_like(points)
+        lo = np.full(2, -np.inf) if lo is None else lo
+        hi = np.full(2, np.inf) if hi is None else hi
+        _transform_paths_kernel(points, offsets, orig_min, orig_size, dest_min, dest_size, lo, hi, out)
+    else:
+        # One in-place pass per operation over the packed buffer, same
+        # arithmetic order as the kernel
+        out = points
+        out -= orig_min
+        out /= orig_size
+        out *= dest_size
+        out += dest_min
+        if lo is not None:
+            np.clip(out, lo, hi, out=out)
+    
+    return [out[offsets[i]:offsets[i + 1]] for i in range(len(paths))]
 
 def create_digitized_kolam(original_dot_coords, traced_paths, estimated_rows, estimated_cols, theme='traditional'):
     """
     Creates an ultra-accurate digitized version that preserves ALL intricate kolam details.
     """
-    # Theme color definitions
-    theme_colors = {
-        'traditional': {'background': '#ffffff', 'stroke': '#000000'},
-        'colorful': {'background': '#ffffff', 'stroke': '#ff6b6b'},
-        'golden': {'background': '#fff8e1', 'stroke': '#ff8f00'},
-        'ocean': {'background': '#e3f2fd', 'stroke': '#1976d2'},
-        'sunset': {'background': '#fce4ec', 'stroke': '#e91e63'},
-        'forest': {'background': '#f1f8e9', 'stroke': '#388e3c'}
-    }
-    
-    colors = theme_colors.get(theme, theme_colors['traditional'])
+    colors = _THEME_COLORS.get(theme, _THEME_COLORS['traditional'])
     
     # 1. Setup a clean canvas and a new, perfectly aligned dot grid
-    image, draw, new_dot_grid = _setup_canvas_and_dots(estimated_rows, estimated_cols, background_color=colors['background'])
+    image, draw, grid_bounds = _setup_canvas_and_dots(estimated_rows, estimated_cols, background_color=colors['background'])
     
     if not traced_paths:
         return _image_to_b64(image)
 
     # 2. Get grid bounds
-    new_grid_flat = [item for sublist in new_dot_grid for item in sublist]
-    dest_coords = np.array(new_grid_flat)
-    dest_min_x, dest_min_y = np.min(dest_coords, axis=0)
-    dest_max_x, dest_max_y = np.max(dest_coords, axis=0)
-    dest_width = dest_max_x - dest_min_x
-    dest_height = dest_max_y - dest_min_y
+    dest_min = np.array(grid_bounds[:2], dtype=np.float64)
+    dest_size = np.array(grid_bounds[2:], dtype=np.float64) - dest_min
 
     # 3. Calculate transformation parameters
     if len(original_dot_coords) > 0:
         orig_coords = np.array(original_dot_coords)
-        orig_min_x, orig_min_y = np.min(orig_coords, axis=0)
-        orig_max_x, orig_max_y = np.max(orig_coords, axis=0)
-        orig_width = orig_max_x - orig_min_x
-        orig_height = orig_max_y - orig_min_y
+        orig_min = np.min(orig_coords, axis=0).astype(np.float64)
+        orig_size = np.max(orig_coords, axis=0) - orig_min
     else:
-        orig_min_x = orig_min_y = 0
-        orig_width = orig_height = 1
+        orig_min = np.zeros(2)
+        orig_size = np.ones(2)
+    # Degenerate dot spreads collapse every point onto the grid centre
+    can_normalize = orig_size[0] > 0 and orig_size[1] > 0
 
     # 4. Process and draw each traced path with maximum detail preservation
-    for path in traced_paths:
-        if len(path) < 2:
-            continue
-            
-        # Transform to grid coordinates with ultra-high precision
-        transformed_path = []
-        for (x, y) in path:
-            if orig_width > 0 and orig_height > 0:
-                # Normalize to 0-1 with ultra-high precision
-                norm_x = (x - orig_min_x) / orig_width
-                norm_y = (y - orig_min_y) / orig_height
-            else:
-                norm_x = 0.5
-                norm_y = 0.5
-            
-            # Map to grid coordinates
-            new_x = dest_min_x + (norm_x * dest_width)
-            new_y = dest_min_y + (norm_y * dest_height)
-            
-            transformed_path.append((new_x, new_y))
-        
-        # Draw the path with maximum detail preservation
-        if len(transformed_path) > 1:
-            # Use thin lines to preserve intricate details
-            line_width = max(1, min(3, int(200 / (estimated_rows * estimated_cols))))
-            
-            # Draw each line segment individually for maximum control
-            for i in range(len(transformed_path) - 1):
-                start = transformed_path[i]
-                end = transformed_path[i + 1]
-                
-                # Draw with precise control
-                draw.line([start, end], fill=colors['stroke'], width=line_width)
+    paths = [path for path in traced_paths if len(path) >= 2]
+    # Use thin lines to preserve intricate details
+    line_width = max(1, min(3, int(200 / (estimated_rows * estimated_cols))))
+    
+    if not can_normalize:
+        # Every path collapses onto the grid centre, so one stroke draws them all
+        if paths:
+            centre = tuple((dest_min + 0.5 * dest_size).tolist())
+            draw.line([centre, centre], fill=colors['stroke'], width=line_width, joint='curve')
+        return _image_to_b64(image)
+    
+    # Transform to grid coordinates with ultra-high precision
+    for transformed_path in _transform_paths(paths, orig_min, orig_size, dest_min, dest_size):
+        # Draw the whole polyline in one call from a flat [x0, y0, x1, y1, ...]
+        # list; curved joints keep corners smooth. PIL truncates coordinates to
+        # ints anyway, so hand it ints directly
+        draw.line(transformed_path.astype(np.int32).ravel().tolist(), fill=colors['stroke'], width=line_width, joint='curve')
 
     return _image_to_b64(image)
 
-def _smooth_path_light(path, window_size=3):
-    """Light smoothing that preserves more details."""
+def _moving_average(path, window_size):
+    """Moving average over a path via cumulative sums; windows shrink at the ends."""
     if len(path) < window_size:
         return path
     
-    smoothed = []
-    for i in range(len(path)):
-        start_idx = max(0, i - window_size // 2)
-        end_idx = min(len(path), i + window_size // 2 + 1)
-        
-        window = path[start_idx:end_idx]
-        avg_x = sum(point[0] for point in window) / len(window)
-        avg_y = sum(point[1] for point in window) / len(window)
-        smoothed.append((int(avg_x), int(avg_y)))
+    points = np.asarray(path, dtype=np.float64).reshape(-1, 2)
+    csum = np.concatenate([np.zeros((1, 2)), points.cumsum(axis=0)])
+    
+    n = len(points)
+    index = np.arange(n)
+    start_idx = np.maximum(0, index - window_size // 2)
+    end_idx = np.minimum(n, index + window_size // 2 + 1)
     
-    return smoothed
+    averages = (csum[end_idx] - csum[start_idx]) / (end_idx - start_idx)[:, None]
+    return list(map(tuple, averages.astype(np.int64).tolist()))
+
+def _smooth_path_light(path, window_size=3):
+    """Light smoothing that preserves more details."""
+    return _moving_average(path, window_size)
 
 def _smooth_path(path, window_size=5):
     """Smooth a path using moving average."""
-    if len(path) < window_size:
-        return path
-    
-    smoothed = []
-    for i in range(len(path)):
-        start_idx = max(0, i - window_size // 2)
-        end_idx = min(len(path), i + window_size // 2 + 1)
-        
-        window = path[start_idx:end_idx]
-        avg_x = sum(point[0] for point in window) / len(window)
-        avg_y = sum(point[1] for point in window) / len(window)
-        smoothed.append((int(avg_x), int(avg_y)))
-    
-    return smoothed
+    return _moving_average(path, window_size)
 
 def create_custom_grid_kolam(original_dot_coords, traced_paths, custom_rows, custom_cols):
     """
     Creates a custom grid version that STRICTLY respects the specified dimensions.
     """
     # 1. Setup canvas with EXACT custom grid dimensions
-    image, draw, new_dot_grid = _setup_canvas_and_dots(custom_rows, custom_cols)
+    image, draw, grid_bounds = _setup_canvas_and_dots(custom_rows, custom_cols)
     
     if not traced_paths:
         return _image_to_b64(image)
 
-    # 2. Get the actual grid dot positions
-    grid_dots = []
-    for row in new_dot_grid:
-        for dot in row:
-            grid_dots.append(dot)
-    
-    if not grid_dots:
+    # 2. Make sure the grid has at least one dot
+    if grid_bounds is None:
         return _image_to_b64(image)
     
     # 3. Calculate grid bounds
-    grid_coords = np.array(grid_dots)
-    min_x, min_y = np.min(grid_coords, axis=0)
-    max_x, max_y = np.max(grid_coords, axis=0)
-    
-    # 4. Create a mapping from original pattern to grid coordinates
-    for path in traced_paths:
-        if len(path) < 2:
-            continue
-            
-        # Convert path to grid coordinates
-        grid_path = []
-        for x, y in path:
-            # Map to grid space (0 to 1)
-            if len(original_dot_coords) > 0:
-                orig_coords = np.array(original_dot_coords)
-                orig_min_x, orig_min_y = np.min(orig_coords, axis=0)
-                orig_max_x, orig_max_y = np.max(orig_coords, axis=0)
-                orig_width = orig_max_x - orig_min_x
-                orig_height = orig_max_y - orig_min_y
-                
-                if orig_width > 0 and orig_height > 0:
-                    # Normalize to 0-1
-                    norm_x = (x - orig_min_x) / orig_width
-                    norm_y = (y - orig_min_y) / orig_height
-                else:
-                    norm_x = 0.5
-                    norm_y = 0.5
-            else:
-                norm_x = 0.5
-                norm_y = 0.5
-            
-            # Map to actual grid coordinates
-            grid_x = min_x + norm_x * (max_x - min_x)
-            grid_y = min_y + norm_y * (max_y - min_y)
-            
-            # Ensure within bounds
-            grid_x = max(min_x, min(max_x, grid_x))
-            grid_y = max(min_y, min(max_y, grid_y))
-            
-            grid_path.append((grid_x, grid_y))
-        
-        # Draw the path
-        if len(grid_path) > 1:
-            line_width = max(2, min(4, int(400 / (custom_rows * custom_cols))))
-            draw.line(grid_path, fill='red', width=line_width, joint='curve')
+    grid_min = np.array(grid_bounds[:2], dtype=np.float64)
+    grid_max = np.array(grid_bounds[2:], dtype=np.float64)
+    grid_size = grid_max - grid_min
+    
+    # 4. Source bounds are the same for every path, so compute them once
+    can_normalize = False
+    if len(original_dot_coords) > 0:
+        orig_coords = np.array(original_dot_coords)
+        orig_min = np.min(orig_coords, axis=0).astype(np.float64)
+        orig_size = np.max(orig_coords, axis=0) - orig_min
+        can_normalize = orig_size[0] > 0 and orig_size[1] > 0
+    
+    # 5. Create a mapping from original pattern to grid coordinates
+    paths = [path for path in traced_paths if len(path) >= 2]
+    line_width = max(2, min(4, int(400 / (custom_rows * custom_cols))))
+    
+    if not can_normalize:
+        # Every path collapses onto the grid centre, so one stroke draws them all
+        if paths:
+            centre = tuple((grid_min + 0.5 * grid_size).tolist())
+            draw.line([centre, centre], fill='red', width=line_width, joint='curve')
+        return _image_to_b64(image)
+    
+    # Convert paths to grid coordinates (0 to 1, then onto the grid), clamped
+    # to the grid bounds
+    for grid_points in _transform_paths(paths, orig_min, orig_size, grid_min, grid_size, grid_min, grid_max):
+        # Draw the path from a flat coordinate list
+        draw.line(grid_points.astype(np.int32).ravel().tolist(), fill='red', width=line_width, joint='curve')
 
     return _image_to_b64(image)
 
 # --- Helper Functions ---
 
 def _setup_canvas_and_dots(rows, cols, image_size=(500, 500), dot_color='black', background_color='white'):
-    """Setup canvas with dot grid."""
+    """
+    Setup the canvas for a dot grid. Dots are not drawn, so only the grid's bounding
+    box (min_x, min_y, max_x, max_y) is returned, or None for an empty grid.
+    """
     image = Image.new('RGB', image_size, background_color)
     draw = ImageDraw.Draw(image)
     padding = 50
     dot_radius = max(2, min(8, int(250 / (rows * 2))))
     
+    if rows < 1 or cols < 1:
+        return image, draw, None
+    
     cell_width = (image_size[0] - 2 * padding) / (cols - 1) if cols > 1 else 0
     cell_height = (image_size[1] - 2 * padding) / (rows - 1) if rows > 1 else 0
     
-    dot_grid = []
-    for r in range(rows):
-        row_coords = []
-        for c in range(cols):
-            x = padding + c * cell_width
-            y = padding + r * cell_height
-            row_coords.append((x, y))
-            # Dots removed - only keep coordinates for reference
-        dot_grid.append(row_coords)
-        
-    return image, draw, dot_grid
+    bounds = (padding, padding, padding + (cols - 1) * cell_width, padding + (rows - 1) * cell_height)
+    return image, draw, bounds
 
 def _image_to_b64(image):
     """Convert PIL image to base64 string."""
     buffered = io.BytesIO()
-    image.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+    # Fast deflate: these renders are previews, so encode time matters more than size
+    image.save(buffered, format="PNG", compress_level=1)
+    # Encode straight from the buffer's memory instead of copying it out first
+    return base64.b64encode(buffered.getbuffer()).decode("ascii")
@@ -5,35 +5,189 @@ Different types of Kolam generators for various traditional South Indian pattern
 import numpy as np
 import random
 import math
+from functools import lru_cache
 from typing import List, Dict, Tuple, Any
 from .zen_kolam_generator import zen_kolam_generator
+from .jit import njit, prange, NUMBA_AVAILABLE
+
+# Fixed sample grids of the curve templates and center patterns, and the trig
+# tables that depend only on them, computed once at import
+_T12 = np.linspace(0, 1, 12)
+_T16 = np.linspace(0, 1, 16)
+_T20 = np.linspace(0, 1, 20)
+_T24 = np.linspace(0, 1, 24)
+_TURN24 = np.linspace(0, 2 * math.pi, 24)
+_TURN32 = np.linspace(0, 2 * math.pi, 32)
+_TURN40 = np.linspace(0, 2 * math.pi, 40)
+
+_COS_TURN24 = np.cos(_TURN24)
+_SIN_TURN24 = np.sin(_TURN24)
+_COS_TURN32 = np.cos(_TURN32)
+_SIN_TURN32 = np.sin(_TURN32)
+_SIN_2TURN32 = np.sin(2 * _TURN32)
+_SIN_3TURN32 = np.sin(_TURN32 * 3)
+_SIN_4TURN40 = np.sin(_TURN40 * 4)
+_SIN_PI_T20 = np.sin(_T20 * math.pi)
+_SIN_2PI_T16 = np.sin(_T16 * math.pi * 2)
+_SIN_2PI_T24 = np.sin(_T24 * math.pi * 2)
+_SIN_3PI_T16 = np.sin(_T16 * math.pi * 3)
+_SIN_3PI_T20 = np.sin(_T20 * math.pi * 3)
+_SIN_4PI_T20 = np.sin(_T20 * math.pi * 4)
+_SIN_5PI_T20 = np.sin(_T20 * math.pi * 5)
+_SIN_6PI_T16 = np.sin(_T16 * math.pi * 6)
+
+@lru_cache(maxsize=32)
+def _dot_layout(size: int, cell_spacing: int) -> Tuple[Tuple[str, int, int], ...]:
+    """Ids and centers of a size x size dot grid, cached per size"""
+    return tuple(
+        (f'dot-{i}-{j}', (j + 1) * cell_spacing, (i + 1) * cell_spacing)
+        for i in range(size) for j in range(size)
+    )
+
+@lru_cache(maxsize=32)
+def _grid_cells(size: int, cell_spacing: int) -> List[List[Dict]]:
+    """Grid cells with their dot centers, cached per size and shared read-only"""
+    # Cell coordinates along one axis, shared by rows and columns
+    coords = (np.arange(1, size + 1) * cell_spacing).tolist()
+    return [[{
+        'row': i,
+        'col': j,
+        'patternId': 1,
+        'dotCenter': {
+            'x': coords[j],
+            'y': coords[i]
+        }
+    } for j in range(size)] for i in range(size)]
+
+@njit(parallel=True, cache=True)
+def _place_templates_kernel(dx, dy, centers, out_x, out_y):
+    """Translate (K, N) offset templates onto every dot center"""
+    for dot in prange(centers.shape[0]):
+        center_x = centers[dot, 0]
+        center_y = centers[dot, 1]
+        for k in range(dx.shape[0]):
+            for n in range(dx.shape[1]):
+                out_x[dot, k, n] = center_x + dx[k, n]
+                out_y[dot, k, n] = center_y + dy[k, n]
+
+def _place_templates(dx, dy, centers):
+    """Place curve templates on all dots at once, returning (dots, K, N) x and y arrays"""
+    if not NUMBA_AVAILABLE:
+        return centers[:, 0, None, None] + dx, centers[:, 1, None, None] + dy
+    
+    out_x = np.empty((len(centers),) + dx.shape)
+    out_y = np.empty_like(out_x)
+    _place_templates_kernel(dx, dy, centers, out_x, out_y)
+    return out_x, out_y
+
+def _to_points(xs, ys, closed=False) -> List[Dict]:
+    """
+    Convert coordinate arrays into the curvePoints dict format. Closed curves
+    end with a copy of the first point rather than the same dict.
+    """
+    points = [{'x': x, 'y': y} for x, y in zip(xs.tolist(), ys.tolist())]
+    if closed:
+        points.append(dict(points[0]))
+    return points
+
+# Connector directions from a dot: right, down and both diagonals
+_CONNECTOR_DIRECTIONS = np.array([(0, 1), (1, 0), (1, 1), (1, -1)])
+
+@lru_cache(maxsize=32)
+def _valid_edges(size: int) -> np.ndarray:
+    """
+    Connector edges of a size x size grid whose neighbour is inside the grid,
+    as a read-only (M, 4) array of (row, col, d_row, d_col) in grid order
+    """
+    dot = np.repeat(np.arange(size * size), len(_CONNECTOR_DIRECTIONS))
+    direction = np.tile(_CONNECTOR_DIRECTIONS, (size * size, 1))
+    row, col = np.divmod(dot, size)
+    neighbor_row = row + direction[:, 0]
+    neighbor_col = col + direction[:, 1]
+    valid = (neighbor_row < size) & (neighbor_col >= 0) & (neighbor_col < size)
+    
+    edges = np.column_stack([row[valid], col[valid], direction[valid]])
+    edges.setflags(write=False)
+    return edges
+
+def _connectors(centers, size, t, wave):
+    """
+    Wavy connectors between every pair of adjacent dots in one broadcast.
+    Returns the edges from _valid_edges plus (M, N) x and y arrays, offsetting
+    each connector by `wave` along its normal.
+    """
+    edges = _valid_edges(size)
+    src = centers[edges[:, 0] * size + edges[:, 1]]
+    delta = centers[(edges[:, 0] + edges[:, 2]) * size + edges[:, 1] + edges[:, 3]] - src
+    
+    # Unit vector perpendicular to each connector, constant along it
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    cos_perp = -delta[:, 1] / length
+    sin_perp = delta[:, 0] / length
+    
+    # Interpolate between dots, then add the wave along the normal
+    xs = src[:, 0, None] + t * delta[:, 0, None] + wave * cos_perp[:, None]
+    ys = src[:, 1, None] + t * delta[:, 1, None] + wave * sin_perp[:, None]
+    return edges, xs, ys
 
 class KolamTypeGenerator:
     """Base class for different kolam type generators"""
     
+    # Output depends only on `size`, so generated patterns can be cached
+    deterministic = True
+    
     def __init__(self):
         self.cell_spacing = 60
     
     def generate_dots_grid(self, size: int) -> List[Dict]:
         """Generate a grid of dots for the kolam"""
-        dots = []
-        for i in range(size):
-            for j in range(size):
-                dots.append({
-                    'id': f'dot-{i}-{j}',
-                    'center': {
-                        'x': (j + 1) * self.cell_spacing,
-                        'y': (i + 1) * self.cell_spacing
-                    },
-                    'radius': 3,
-                    'color': '#000000',
-                    'filled': True
-                })
-        return dots
+        # The layout is cached; fresh dicts are built so callers may mutate them
+        return [{
+            'id': dot_id,
+            'center': {
+                'x': x,
+                'y': y
+            },
+            'radius': 3,
+            'color': '#000000',
+            'filled': True
+        } for dot_id, x, y in _dot_layout(size, self.cell_spacing)]
+    
+    def _dot_centers(self, size: int) -> np.ndarray:
+        """Dot centers as a row-major (size * size, 2) array"""
+        cols, rows = np.meshgrid(np.arange(1, size + 1), np.arange(1, size + 1))
+        centers = np.stack([cols * self.cell_spacing, rows * self.cell_spacing], axis=-1)
+        return centers.reshape(-1, 2).astype(np.float64)
+    
+    def _build_grid(self, size: int) -> Dict[str, Any]:
+        """Build the grid block (cells with their dot centers) of a pattern"""
+        return {
+            'size': size,
+            'cells': _grid_cells(size, self.cell_spacing),
+            'cellSpacing': self.cell_spacing
+        }
+    
+    def _wrap_result(self, size: int, curves: List[Dict], dots: List[Dict], id_prefix: str, name_prefix: str) -> Dict[str, Any]:
+        """Build the pattern dict shared by the grid-based generators"""
+        return {
+            'id': f'{id_prefix}-{size}x{size}',
+            'name': f'{name_prefix} {size}×{size}',
+            'grid': self._build_grid(size),
+            'curves': curves,
+            'dots': dots,
+            'symmetryType': '2D',
+            'dimensions': {
+                'width': (size + 1) * self.cell_spacing,
+                'height': (size + 1) * self.cell_spacing
+            }
+        }
 
 class TraditionalKolamGenerator(KolamTypeGenerator):
     """Traditional 1D symmetry kolam generator (current implementation)"""
     
+    # The zen-kolam algorithm picks patterns at random
+    deterministic = False
+    
     def generate(self, size: int) -> Dict[str, Any]:
         """Generate traditional kolam using zen-kolam algorithm"""
         return zen_kolam_generator.generate_kolam_1d(size)
@@ -46,34 +200,32 @@ class GeometricKolamGenerator(KolamTypeGenerator):
         dots = self.generate_dots_grid(size)
         curves = []
         
+        # Figure-8 parametric equations; the shape does not depend on the dot
+        radius = 0.4 * self.cell_spacing
+        x_offset = radius * _SIN_TURN32
+        y_offset = radius * _SIN_2TURN32 * 0.5
+        
+        # One rotation per direction around the dot, giving (4, 32) offset templates
+        angle_offsets = np.arange(4) * math.pi / 2
+        cos_angle = np.cos(angle_offsets)
+        sin_angle = np.sin(angle_offsets)
+        figure8_dx = np.outer(cos_angle, x_offset) - np.outer(sin_angle, y_offset)
+        figure8_dy = np.outer(sin_angle, x_offset) + np.outer(cos_angle, y_offset)
+        
+        # Translate the templates onto every dot
+        centers = self._dot_centers(size)
+        figure8_x, figure8_y = _place_templates(figure8_dx, figure8_dy, centers)
+        
         # Create curved patterns that weave around every dot
         # Create figure-8 patterns around each dot
         for row in range(size):
             for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
+                figure8_xs = figure8_x[row * size + col]
+                figure8_ys = figure8_y[row * size + col]
                 
                 # Create figure-8 loops around each dot
                 for direction in range(4):  # 4 directions around each dot
-                    angle_offset = direction * math.pi / 2
-                    
-                    # Create figure-8 pattern
-                    figure8_points = []
-                    for t in np.linspace(0, 2 * math.pi, 32):
-                        # Figure-8 parametric equations
-                        radius = 0.4 * self.cell_spacing
-                        x_offset = radius * math.sin(t)
-                        y_offset = radius * math.sin(2 * t) * 0.5
-                        
-                        # Rotate based on direction
-                        cos_angle = math.cos(angle_offset)
-                        sin_angle = math.sin(angle_offset)
-                        rotated_x = x_offset * cos_angle - y_offset * sin_angle
-                        rotated_y = x_offset * sin_angle + y_offset * cos_angle
-                        
-                        x = dot_x + rotated_x
-                        y = dot_y + rotated_y
-                        figure8_points.append({'x': x, 'y': y})
+                    figure8_points = _to_points(figure8_xs[direction], figure8_ys[direction])
                     
                     curves.append({
                         'id': f'figure8-{row}-{col}-{direction}',
@@ -84,63 +236,39 @@ class GeometricKolamGenerator(KolamTypeGenerator):
                         'color': '#000000'
                     })
         
+        # Connector samples and their curve wave, shared by every connector
+        t = _T16
+        curve_amplitude = 0.3 * self.cell_spacing
+        curve_wave = curve_amplitude * _SIN_3PI_T16  # frequency 3
+        
         # Create connecting curves between adjacent dots
-        for row in range(size):
-            for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
-                
-                # Connect to adjacent dots with curved paths
-                for direction in [(0, 1), (1, 0), (1, 1), (1, -1)]:  # right, down, diagonal
-                    neighbor_row = row + direction[0]
-                    neighbor_col = col + direction[1]
-                    
-                    if 0 <= neighbor_row < size and 0 <= neighbor_col < size:
-                        neighbor_x = (neighbor_col + 1) * self.cell_spacing
-                        neighbor_y = (neighbor_row + 1) * self.cell_spacing
-                        
-                        # Create curved connector
-                        connector_points = []
-                        for t in np.linspace(0, 1, 16):
-                            # Interpolate between dots
-                            current_x = dot_x + t * (neighbor_x - dot_x)
-                            current_y = dot_y + t * (neighbor_y - dot_y)
-                            
-                            # Add curve variation
-                            curve_amplitude = 0.3 * self.cell_spacing
-                            curve_frequency = 3
-                            curve_x = current_x + curve_amplitude * math.sin(t * math.pi * curve_frequency) * math.cos(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            curve_y = current_y + curve_amplitude * math.sin(t * math.pi * curve_frequency) * math.sin(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            
-                            connector_points.append({'x': curve_x, 'y': curve_y})
-                        
-                        curves.append({
-                            'id': f'connector-{row}-{col}-{direction[0]}-{direction[1]}',
-                            'start': connector_points[0],
-                            'end': connector_points[-1],
-                            'curvePoints': connector_points,
-                            'strokeWidth': 2,
-                            'color': '#000000'
-                        })
+        edges, connector_x, connector_y = _connectors(centers, size, t, curve_wave)
+        for (row, col, d_row, d_col), xs, ys in zip(edges.tolist(), connector_x, connector_y):
+            connector_points = _to_points(xs, ys)
+            
+            curves.append({
+                'id': f'connector-{row}-{col}-{d_row}-{d_col}',
+                'start': connector_points[0],
+                'end': connector_points[-1],
+                'curvePoints': connector_points,
+                'strokeWidth': 2,
+                'color': '#000000'
+            })
         
         # Create center spiral pattern
         center_row = size // 2
         center_col = size // 2
-        center_x = (center_col + 1) * self.cell_spacing
-        center_y = (center_row + 1) * self.cell_spacing
+        center_x, center_y = centers[center_row * size + center_col].tolist()
+        
+        # Create multiple spirals from center, shape (3, 40)
+        spiral_angle = (np.arange(3) * 2 * math.pi / 3)[:, None]
+        radius = _TURN40 * (size // 2) * self.cell_spacing * 0.3
+        angle = spiral_angle + _TURN40 * 2
+        center_spiral_x = center_x + radius * np.cos(angle)
+        center_spiral_y = center_y + radius * np.sin(angle)
         
-        # Create multiple spirals from center
         for spiral in range(3):
-            spiral_angle = spiral * 2 * math.pi / 3
-            spiral_points = []
-            
-            for t in np.linspace(0, 2 * math.pi, 40):
-                radius = t * (size // 2) * self.cell_spacing * 0.3
-                angle = spiral_angle + t * 2
-                
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                spiral_points.append({'x': x, 'y': y})
+            spiral_points = _to_points(center_spiral_x[spiral], center_spiral_y[spiral])
             
             curves.append({
                 'id': f'center-spiral-{spiral}',
@@ -151,30 +279,7 @@ class GeometricKolamGenerator(KolamTypeGenerator):
                 'color': '#000000'
             })
         
-        return {
-            'id': f'geometric-kolam-{size}x{size}',
-            'name': f'Geometric Kolam {size}×{size}',
-            'grid': {
-                'size': size,
-                'cells': [[{
-                    'row': i,
-                    'col': j,
-                    'patternId': 1,
-                    'dotCenter': {
-                        'x': (j + 1) * self.cell_spacing,
-                        'y': (i + 1) * self.cell_spacing
-                    }
-                } for j in range(size)] for i in range(size)],
-                'cellSpacing': self.cell_spacing
-            },
-            'curves': curves,
-            'dots': dots,
-            'symmetryType': '2D',
-            'dimensions': {
-                'width': (size + 1) * self.cell_spacing,
-                'height': (size + 1) * self.cell_spacing
-            }
-        }
+        return self._wrap_result(size, curves, dots, 'geometric-kolam', 'Geometric Kolam')
 
 class FloralKolamGenerator(KolamTypeGenerator):
     """Floral and nature-inspired kolam patterns using grid points"""
@@ -184,35 +289,43 @@ class FloralKolamGenerator(KolamTypeGenerator):
         dots = self.generate_dots_grid(size)
         curves = []
         
+        # Flower petal templates around a dot, shape (6, 20)
+        num_petals = 6
+        petal_angle = (np.arange(num_petals) * 2 * math.pi / num_petals)[:, None]
+        
+        # Petal shape using parametric equations
+        petal_radius = 0.5 * self.cell_spacing * _T20
+        
+        # Create petal curve
+        petal_curve = 0.3 * self.cell_spacing * _SIN_PI_T20 * np.sin(petal_angle * 2)
+        
+        # Petal position plus curve variation
+        petal_dx = petal_radius * np.cos(petal_angle) + petal_curve * np.cos(petal_angle + math.pi/2)
+        petal_dy = petal_radius * np.sin(petal_angle) + petal_curve * np.sin(petal_angle + math.pi/2)
+        
+        # Small loop templates around a dot, shape (3, 12)
+        loop_angle = (np.arange(3) * 2 * math.pi / 3)[:, None]
+        radius = 0.2 * self.cell_spacing * _T12
+        angle = loop_angle + _T12 * 2 * math.pi
+        loop_dx = radius * np.cos(angle)
+        loop_dy = radius * np.sin(angle)
+        
+        # Translate the templates onto every dot
+        centers = self._dot_centers(size)
+        petal_x, petal_y = _place_templates(petal_dx, petal_dy, centers)
+        loop_x, loop_y = _place_templates(loop_dx, loop_dy, centers)
+        
         # Create flower patterns that weave around every dot
         for row in range(size):
             for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
+                dot = row * size + col
                 
                 # Create flower petals around each dot
-                num_petals = 6
+                petal_xs = petal_x[dot]
+                petal_ys = petal_y[dot]
+                
                 for petal in range(num_petals):
-                    petal_angle = petal * 2 * math.pi / num_petals
-                    petal_points = []
-                    
-                    # Create curved petal around dot
-                    for t in np.linspace(0, 1, 20):
-                        # Petal shape using parametric equations
-                        petal_radius = 0.5 * self.cell_spacing * t
-                        
-                        # Create petal curve
-                        petal_curve = 0.3 * self.cell_spacing * math.sin(t * math.pi) * math.sin(petal_angle * 2)
-                        
-                        # Calculate petal position
-                        base_x = dot_x + petal_radius * math.cos(petal_angle)
-                        base_y = dot_y + petal_radius * math.sin(petal_angle)
-                        
-                        # Add curve variation
-                        curve_x = base_x + petal_curve * math.cos(petal_angle + math.pi/2)
-                        curve_y = base_y + petal_curve * math.sin(petal_angle + math.pi/2)
-                        
-                        petal_points.append({'x': curve_x, 'y': curve_y})
+                    petal_points = _to_points(petal_xs[petal], petal_ys[petal])
                     
                     curves.append({
                         'id': f'petal-{row}-{col}-{petal}',
@@ -224,20 +337,12 @@ class FloralKolamGenerator(KolamTypeGenerator):
                     })
                 
                 # Create small loops around each dot
+                loop_xs = loop_x[dot]
+                loop_ys = loop_y[dot]
+                
                 for loop in range(3):
-                    loop_angle = loop * 2 * math.pi / 3
-                    loop_points = []
-                    
-                    for t in np.linspace(0, 1, 12):
-                        radius = 0.2 * self.cell_spacing * t
-                        angle = loop_angle + t * 2 * math.pi
-                        
-                        x = dot_x + radius * math.cos(angle)
-                        y = dot_y + radius * math.sin(angle)
-                        loop_points.append({'x': x, 'y': y})
-                    
-                    # Close the loop
-                    loop_points.append(loop_points[0])
+                    # Closed loop, ending on a copy of its first point
+                    loop_points = _to_points(loop_xs[loop], loop_ys[loop], closed=True)
                     
                     curves.append({
                         'id': f'dot-loop-{row}-{col}-{loop}',
@@ -251,26 +356,22 @@ class FloralKolamGenerator(KolamTypeGenerator):
         # Create center flower pattern
         center_row = size // 2
         center_col = size // 2
-        center_x = (center_col + 1) * self.cell_spacing
-        center_y = (center_row + 1) * self.cell_spacing
+        center_x, center_y = centers[center_row * size + center_col].tolist()
         
-        # Create large flower from center
+        # Create large flower from center, one curved petal per row, shape (8, 24)
         num_center_petals = 8
+        angle = (np.arange(num_center_petals) * 2 * math.pi / num_center_petals)[:, None]
+        petal_radius = _T24 * (size // 2) * self.cell_spacing * 0.7
+        petal_angle = angle + (_T24 - 0.5) * 0.3
+        
+        # Add organic curve variation
+        curve_variation = 0.3 * self.cell_spacing * _SIN_2PI_T24 * np.sin(angle * 3)
+        
+        center_petal_x = center_x + petal_radius * np.cos(petal_angle) + curve_variation * np.cos(petal_angle + math.pi/2)
+        center_petal_y = center_y + petal_radius * np.sin(petal_angle) + curve_variation * np.sin(petal_angle + math.pi/2)
+        
         for i in range(num_center_petals):
-            angle = i * 2 * math.pi / num_center_petals
-            petal_points = []
-            
-            # Create large curved petal from center
-            for t in np.linspace(0, 1, 24):
-                petal_radius = t * (size // 2) * self.cell_spacing * 0.7
-                petal_angle = angle + (t - 0.5) * 0.3
-                
-                # Add organic curve variation
-                curve_variation = 0.3 * self.cell_spacing * math.sin(t * math.pi * 2) * math.sin(angle * 3)
-                
-                x = center_x + petal_radius * math.cos(petal_angle) + curve_variation * math.cos(petal_angle + math.pi/2)
-                y = center_y + petal_radius * math.sin(petal_angle) + curve_variation * math.sin(petal_angle + math.pi/2)
-                petal_points.append({'x': x, 'y': y})
+            petal_points = _to_points(center_petal_x[i], center_petal_y[i])
             
             curves.append({
                 'id': f'center-petal-{i}',
@@ -281,69 +382,26 @@ class FloralKolamGenerator(KolamTypeGenerator):
                 'color': '#000000'
             })
         
+        # Vine samples and wave, shared by every connector
+        t = _T20
+        vine_amplitude = 0.4 * self.cell_spacing
+        vine_wave = vine_amplitude * _SIN_4PI_T20  # frequency 4
+        
         # Create connecting vines between dots
-        for row in range(size):
-            for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
-                
-                # Connect to adjacent dots with vine-like curves
-                for direction in [(0, 1), (1, 0), (1, 1), (1, -1)]:
-                    neighbor_row = row + direction[0]
-                    neighbor_col = col + direction[1]
-                    
-                    if 0 <= neighbor_row < size and 0 <= neighbor_col < size:
-                        neighbor_x = (neighbor_col + 1) * self.cell_spacing
-                        neighbor_y = (neighbor_row + 1) * self.cell_spacing
-                        
-                        # Create vine-like connector
-                        vine_points = []
-                        for t in np.linspace(0, 1, 20):
-                            # Interpolate between dots
-                            current_x = dot_x + t * (neighbor_x - dot_x)
-                            current_y = dot_y + t * (neighbor_y - dot_y)
-                            
-                            # Add vine curve
-                            vine_amplitude = 0.4 * self.cell_spacing
-                            vine_frequency = 4
-                            vine_x = current_x + vine_amplitude * math.sin(t * math.pi * vine_frequency) * math.cos(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            vine_y = current_y + vine_amplitude * math.sin(t * math.pi * vine_frequency) * math.sin(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            
-                            vine_points.append({'x': vine_x, 'y': vine_y})
-                        
-                        curves.append({
-                            'id': f'vine-{row}-{col}-{direction[0]}-{direction[1]}',
-                            'start': vine_points[0],
-                            'end': vine_points[-1],
-                            'curvePoints': vine_points,
-                            'strokeWidth': 1,
-                            'color': '#000000'
-                        })
+        edges, connector_x, connector_y = _connectors(centers, size, t, vine_wave)
+        for (row, col, d_row, d_col), xs, ys in zip(edges.tolist(), connector_x, connector_y):
+            vine_points = _to_points(xs, ys)
+            
+            curves.append({
+                'id': f'vine-{row}-{col}-{d_row}-{d_col}',
+                'start': vine_points[0],
+                'end': vine_points[-1],
+                'curvePoints': vine_points,
+                'strokeWidth': 1,
+                'color': '#000000'
+            })
         
-        return {
-            'id': f'floral-kolam-{size}x{size}',
-            'name': f'Floral Kolam {size}×{size}',
-            'grid': {
-                'size': size,
-                'cells': [[{
-                    'row': i,
-                    'col': j,
-                    'patternId': 1,
-                    'dotCenter': {
-                        'x': (j + 1) * self.cell_spacing,
-                        'y': (i + 1) * self.cell_spacing
-                    }
-                } for j in range(size)] for i in range(size)],
-                'cellSpacing': self.cell_spacing
-            },
-            'curves': curves,
-            'dots': dots,
-            'symmetryType': '2D',
-            'dimensions': {
-                'width': (size + 1) * self.cell_spacing,
-                'height': (size + 1) * self.cell_spacing
-            }
-        }
+        return self._wrap_result(size, curves, dots, 'floral-kolam', 'Floral Kolam')
 
 class MandalaKolamGenerator(KolamTypeGenerator):
     """Mandala-style kolam with intricate patterns using grid points"""
@@ -353,24 +411,40 @@ class MandalaKolamGenerator(KolamTypeGenerator):
         dots = self.generate_dots_grid(size)
         curves = []
         
+        # Concentric circle templates around a dot, shape (3, 24)
+        circle_radius = ((np.arange(3) + 1) * 0.2 * self.cell_spacing)[:, None]
+        circle_dx = circle_radius * _COS_TURN24
+        circle_dy = circle_radius * _SIN_TURN24
+        
+        # Lotus petal templates around a dot, shape (8, 16)
+        num_petals = 8
+        petal_angle = (np.arange(num_petals) * 2 * math.pi / num_petals)[:, None]
+        petal_radius = 0.4 * self.cell_spacing * _T16
+        angle = petal_angle + (_T16 - 0.5) * 0.2
+        
+        # Add curve variation for organic look
+        curve_variation = 0.2 * self.cell_spacing * _SIN_2PI_T16 * np.sin(petal_angle * 4)
+        
+        petal_dx = petal_radius * np.cos(angle) + curve_variation * np.cos(angle + math.pi/2)
+        petal_dy = petal_radius * np.sin(angle) + curve_variation * np.sin(angle + math.pi/2)
+        
+        # Translate the templates onto every dot
+        centers = self._dot_centers(size)
+        circle_x, circle_y = _place_templates(circle_dx, circle_dy, centers)
+        petal_x, petal_y = _place_templates(petal_dx, petal_dy, centers)
+        
         # Create mandala patterns that weave around every dot
         for row in range(size):
             for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
+                dot = row * size + col
                 
                 # Create concentric circles around each dot
+                circle_xs = circle_x[dot]
+                circle_ys = circle_y[dot]
+                
                 for circle in range(3):
-                    circle_radius = (circle + 1) * 0.2 * self.cell_spacing
-                    circle_points = []
-                    
-                    for t in np.linspace(0, 2 * math.pi, 24):
-                        x = dot_x + circle_radius * math.cos(t)
-                        y = dot_y + circle_radius * math.sin(t)
-                        circle_points.append({'x': x, 'y': y})
-                    
-                    # Close the circle
-                    circle_points.append(circle_points[0])
+                    # Closed circle, ending on a copy of its first point
+                    circle_points = _to_points(circle_xs[circle], circle_ys[circle], closed=True)
                     
                     curves.append({
                         'id': f'circle-{row}-{col}-{circle}',
@@ -382,22 +456,11 @@ class MandalaKolamGenerator(KolamTypeGenerator):
                     })
                 
                 # Create lotus petals around each dot
-                num_petals = 8
+                petal_xs = petal_x[dot]
+                petal_ys = petal_y[dot]
+                
                 for petal in range(num_petals):
-                    petal_angle = petal * 2 * math.pi / num_petals
-                    petal_points = []
-                    
-                    # Create curved lotus petal
-                    for t in np.linspace(0, 1, 16):
-                        petal_radius = 0.4 * self.cell_spacing * t
-                        angle = petal_angle + (t - 0.5) * 0.2
-                        
-                        # Add curve variation for organic look
-                        curve_variation = 0.2 * self.cell_spacing * math.sin(t * math.pi * 2) * math.sin(petal_angle * 4)
-                        
-                        x = dot_x + petal_radius * math.cos(angle) + curve_variation * math.cos(angle + math.pi/2)
-                        y = dot_y + petal_radius * math.sin(angle) + curve_variation * math.sin(angle + math.pi/2)
-                        petal_points.append({'x': x, 'y': y})
+                    petal_points = _to_points(petal_xs[petal], petal_ys[petal])
                     
                     curves.append({
                         'id': f'lotus-petal-{row}-{col}-{petal}',
@@ -411,21 +474,16 @@ class MandalaKolamGenerator(KolamTypeGenerator):
         # Create center mandala pattern
         center_row = size // 2
         center_col = size // 2
-        center_x = (center_col + 1) * self.cell_spacing
-        center_y = (center_row + 1) * self.cell_spacing
+        center_x, center_y = centers[center_row * size + center_col].tolist()
+        
+        # Create concentric circles from center, one layer per row
+        layer_radius = (np.arange(1, (size // 2) + 1) * 0.3 * self.cell_spacing)[:, None]
+        layer_x = center_x + layer_radius * _COS_TURN32
+        layer_y = center_y + layer_radius * _SIN_TURN32
         
-        # Create concentric circles from center
         for layer in range(1, (size // 2) + 1):
-            layer_radius = layer * 0.3 * self.cell_spacing
-            layer_points = []
-            
-            for t in np.linspace(0, 2 * math.pi, 32):
-                x = center_x + layer_radius * math.cos(t)
-                y = center_y + layer_radius * math.sin(t)
-                layer_points.append({'x': x, 'y': y})
-            
-            # Close the circle
-            layer_points.append(layer_points[0])
+            # Closed circle, ending on a copy of its first point
+            layer_points = _to_points(layer_x[layer - 1], layer_y[layer - 1], closed=True)
             
             curves.append({
                 'id': f'center-layer-{layer}',
@@ -436,23 +494,20 @@ class MandalaKolamGenerator(KolamTypeGenerator):
                 'color': '#000000'
             })
         
-        # Create center lotus pattern
+        # Create center lotus pattern, one large petal per row, shape (12, 20)
         num_center_petals = 12
+        angle = (np.arange(num_center_petals) * 2 * math.pi / num_center_petals)[:, None]
+        lotus_radius = _T20 * (size // 2) * self.cell_spacing * 0.8
+        lotus_angle = angle + (_T20 - 0.5) * 0.2
+        
+        # Add curve variation for organic look
+        curve_variation = 0.3 * self.cell_spacing * _SIN_3PI_T20 * np.sin(angle * 6)
+        
+        lotus_x = center_x + lotus_radius * np.cos(lotus_angle) + curve_variation * np.cos(lotus_angle + math.pi/2)
+        lotus_y = center_y + lotus_radius * np.sin(lotus_angle) + curve_variation * np.sin(lotus_angle + math.pi/2)
+        
         for i in range(num_center_petals):
-            angle = i * 2 * math.pi / num_center_petals
-            lotus_points = []
-            
-            # Create large lotus petal from center
-            for t in np.linspace(0, 1, 20):
-                lotus_radius = t * (size // 2) * self.cell_spacing * 0.8
-                lotus_angle = angle + (t - 0.5) * 0.2
-                
-                # Add curve variation for organic look
-                curve_variation = 0.3 * self.cell_spacing * math.sin(t * math.pi * 3) * math.sin(angle * 6)
-                
-                x = center_x + lotus_radius * math.cos(lotus_angle) + curve_variation * math.cos(lotus_angle + math.pi/2)
-                y = center_y + lotus_radius * math.sin(lotus_angle) + curve_variation * math.sin(lotus_angle + math.pi/2)
-                lotus_points.append({'x': x, 'y': y})
+            lotus_points = _to_points(lotus_x[i], lotus_y[i])
             
             curves.append({
                 'id': f'center-lotus-{i}',
@@ -463,69 +518,26 @@ class MandalaKolamGenerator(KolamTypeGenerator):
                 'color': '#000000'
             })
         
+        # Connector samples and their mandala wave, shared by every connector
+        t = _T16
+        mandala_amplitude = 0.3 * self.cell_spacing
+        mandala_wave = mandala_amplitude * _SIN_6PI_T16  # frequency 6
+        
         # Create connecting patterns between dots
-        for row in range(size):
-            for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
-                
-                # Connect to adjacent dots with mandala patterns
-                for direction in [(0, 1), (1, 0), (1, 1), (1, -1)]:
-                    neighbor_row = row + direction[0]
-                    neighbor_col = col + direction[1]
-                    
-                    if 0 <= neighbor_row < size and 0 <= neighbor_col < size:
-                        neighbor_x = (neighbor_col + 1) * self.cell_spacing
-                        neighbor_y = (neighbor_row + 1) * self.cell_spacing
-                        
-                        # Create mandala connector
-                        connector_points = []
-                        for t in np.linspace(0, 1, 16):
-                            # Interpolate between dots
-                            current_x = dot_x + t * (neighbor_x - dot_x)
-                            current_y = dot_y + t * (neighbor_y - dot_y)
-                            
-                            # Add mandala curve
-                            mandala_amplitude = 0.3 * self.cell_spacing
-                            mandala_frequency = 6
-                            mandala_x = current_x + mandala_amplitude * math.sin(t * math.pi * mandala_frequency) * math.cos(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            mandala_y = current_y + mandala_amplitude * math.sin(t * math.pi * mandala_frequency) * math.sin(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            
-                            connector_points.append({'x': mandala_x, 'y': mandala_y})
-                        
-                        curves.append({
-                            'id': f'mandala-connector-{row}-{col}-{direction[0]}-{direction[1]}',
-                            'start': connector_points[0],
-                            'end': connector_points[-1],
-                            'curvePoints': connector_points,
-                            'strokeWidth': 1,
-                            'color': '#000000'
-                        })
+        edges, connector_x, connector_y = _connectors(centers, size, t, mandala_wave)
+        for (row, col, d_row, d_col), xs, ys in zip(edges.tolist(), connector_x, connector_y):
+            connector_points = _to_points(xs, ys)
+            
+            curves.append({
+                'id': f'mandala-connector-{row}-{col}-{d_row}-{d_col}',
+                'start': connector_points[0],
+                'end': connector_points[-1],
+                'curvePoints': connector_points,
+                'strokeWidth': 1,
+                'color': '#000000'
+            })
         
-        return {
-            'id': f'mandala-kolam-{size}x{size}',
-            'name': f'Mandala Kolam {size}×{size}',
-            'grid': {
-                'size': size,
-                'cells': [[{
-                    'row': i,
-                    'col': j,
-                    'patternId': 1,
-                    'dotCenter': {
-                        'x': (j + 1) * self.cell_spacing,
-                        'y': (i + 1) * self.cell_spacing
-                    }
-                } for j in range(size)] for i in range(size)],
-                'cellSpacing': self.cell_spacing
-            },
-            'curves': curves,
-            'dots': dots,
-            'symmetryType': '2D',
-            'dimensions': {
-                'width': (size + 1) * self.cell_spacing,
-                'height': (size + 1) * self.cell_spacing
-            }
-        }
+        return self._wrap_result(size, curves, dots, 'mandala-kolam', 'Mandala Kolam')
 
 class SpiralKolamGenerator(KolamTypeGenerator):
     """Spiral-based kolam patterns using grid points"""
@@ -535,29 +547,41 @@ class SpiralKolamGenerator(KolamTypeGenerator):
         dots = self.generate_dots_grid(size)
         curves = []
         
+        # Spiral templates around a dot (3 spirals per dot), shape (3, 32)
+        spiral_angle = (np.arange(3) * 2 * math.pi / 3)[:, None]
+        radius = 0.4 * self.cell_spacing * _TURN32 / (2 * math.pi)
+        angle = spiral_angle + _TURN32 * 2
+        
+        # Add curve variation for organic look
+        radius_variation = 0.1 * self.cell_spacing * _SIN_3TURN32
+        current_radius = radius + radius_variation
+        
+        spiral_dx = current_radius * np.cos(angle)
+        spiral_dy = current_radius * np.sin(angle)
+        
+        # Small loop templates around a dot, shape (4, 12)
+        loop_angle = (np.arange(4) * math.pi / 2)[:, None]
+        radius = 0.2 * self.cell_spacing * _T12
+        angle = loop_angle + _T12 * math.pi / 2
+        loop_dx = radius * np.cos(angle)
+        loop_dy = radius * np.sin(angle)
+        
+        # Translate the templates onto every dot
+        centers = self._dot_centers(size)
+        spiral_x, spiral_y = _place_templates(spiral_dx, spiral_dy, centers)
+        loop_x, loop_y = _place_templates(loop_dx, loop_dy, centers)
+        
         # Create spiral patterns that weave around every dot
         for row in range(size):
             for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
+                dot = row * size + col
                 
                 # Create multiple spirals around each dot
+                spiral_xs = spiral_x[dot]
+                spiral_ys = spiral_y[dot]
+                
                 for spiral in range(3):  # 3 spirals per dot
-                    spiral_angle = spiral * 2 * math.pi / 3
-                    spiral_points = []
-                    
-                    # Create curved spiral around dot
-                    for t in np.linspace(0, 2 * math.pi, 32):
-                        radius = 0.4 * self.cell_spacing * t / (2 * math.pi)
-                        angle = spiral_angle + t * 2
-                        
-                        # Add curve variation for organic look
-                        radius_variation = 0.1 * self.cell_spacing * math.sin(t * 3)
-                        current_radius = radius + radius_variation
-                        
-                        x = dot_x + current_radius * math.cos(angle)
-                        y = dot_y + current_radius * math.sin(angle)
-                        spiral_points.append({'x': x, 'y': y})
+                    spiral_points = _to_points(spiral_xs[spiral], spiral_ys[spiral])
                     
                     curves.append({
                         'id': f'spiral-{row}-{col}-{spiral}',
@@ -569,20 +593,12 @@ class SpiralKolamGenerator(KolamTypeGenerator):
                     })
                 
                 # Create small loops around each dot
+                loop_xs = loop_x[dot]
+                loop_ys = loop_y[dot]
+                
                 for loop in range(4):
-                    loop_angle = loop * math.pi / 2
-                    loop_points = []
-                    
-                    for t in np.linspace(0, 1, 12):
-                        radius = 0.2 * self.cell_spacing * t
-                        angle = loop_angle + t * math.pi / 2
-                        
-                        x = dot_x + radius * math.cos(angle)
-                        y = dot_y + radius * math.sin(angle)
-                        loop_points.append({'x': x, 'y': y})
-                    
-                    # Close the loop
-                    loop_points.append(loop_points[0])
+                    # Closed loop, ending on a copy of its first point
+                    loop_points = _to_points(loop_xs[loop], loop_ys[loop], closed=True)
                     
                     curves.append({
                         'id': f'loop-{row}-{col}-{loop}',
@@ -596,27 +612,23 @@ class SpiralKolamGenerator(KolamTypeGenerator):
         # Create center spiral pattern
         center_row = size // 2
         center_col = size // 2
-        center_x = (center_col + 1) * self.cell_spacing
-        center_y = (center_row + 1) * self.cell_spacing
+        center_x, center_y = centers[center_row * size + center_col].tolist()
         
-        # Create large spirals from center
+        # Create large spirals from center, one per row, shape (6, 40)
         num_center_spirals = 6
+        spiral_angle = (np.arange(num_center_spirals) * 2 * math.pi / num_center_spirals)[:, None]
+        radius = _TURN40 * (size // 2) * self.cell_spacing * 0.4
+        angle = spiral_angle + _TURN40 * 1.5
+        
+        # Add curve variation for organic look
+        radius_variation = 0.2 * self.cell_spacing * _SIN_4TURN40
+        current_radius = radius + radius_variation
+        
+        center_spiral_x = center_x + current_radius * np.cos(angle)
+        center_spiral_y = center_y + current_radius * np.sin(angle)
+        
         for spiral in range(num_center_spirals):
-            spiral_angle = spiral * 2 * math.pi / num_center_spirals
-            center_spiral_points = []
-            
-            # Create large curved spiral from center
-            for t in np.linspace(0, 2 * math.pi, 40):
-                radius = t * (size // 2) * self.cell_spacing * 0.4
-                angle = spiral_angle + t * 1.5
-                
-                # Add curve variation for organic look
-                radius_variation = 0.2 * self.cell_spacing * math.sin(t * 4)
-                current_radius = radius + radius_variation
-                
-                x = center_x + current_radius * math.cos(angle)
-                y = center_y + current_radius * math.sin(angle)
-                center_spiral_points.append({'x': x, 'y': y})
+            center_spiral_points = _to_points(center_spiral_x[spiral], center_spiral_y[spiral])
             
             curves.append({
                 'id': f'center-spiral-{spiral}',
@@ -627,69 +639,35 @@ class SpiralKolamGenerator(KolamTypeGenerator):
                 'color': '#000000'
             })
         
+        # Connector samples and their spiral wave, shared by every connector
+        t = _T20
+        spiral_amplitude = 0.4 * self.cell_spacing
+        spiral_wave = spiral_amplitude * _SIN_5PI_T20  # frequency 5
+        
         # Create connecting spirals between dots
-        for row in range(size):
-            for col in range(size):
-                dot_x = (col + 1) * self.cell_spacing
-                dot_y = (row + 1) * self.cell_spacing
-                
-                # Connect to adjacent dots with spiral curves
-                for direction in [(0, 1), (1, 0), (1, 1), (1, -1)]:
-                    neighbor_row = row + direction[0]
-                    neighbor_col = col + direction[1]
-                    
-                    if 0 <= neighbor_row < size and 0 <= neighbor_col < size:
-                        neighbor_x = (neighbor_col + 1) * self.cell_spacing
-                        neighbor_y = (neighbor_row + 1) * self.cell_spacing
-                        
-                        # Create spiral connector
-                        connector_points = []
-                        for t in np.linspace(0, 1, 20):
-                            # Interpolate between dots
-                            current_x = dot_x + t * (neighbor_x - dot_x)
-                            current_y = dot_y + t * (neighbor_y - dot_y)
-                            
-                            # Add spiral curve
-                            spiral_amplitude = 0.4 * self.cell_spacing
-                            spiral_frequency = 5
-                            spiral_x = current_x + spiral_amplitude * math.sin(t * math.pi * spiral_frequency) * math.cos(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            spiral_y = current_y + spiral_amplitude * math.sin(t * math.pi * spiral_frequency) * math.sin(math.atan2(neighbor_y - dot_y, neighbor_x - dot_x) + math.pi/2)
-                            
-                            connector_points.append({'x': spiral_x, 'y': spiral_y})
-                        
-                        curves.append({
-                            'id': f'spiral-connector-{row}-{col}-{direction[0]}-{direction[1]}',
-                            'start': connector_points[0],
-                            'end': connector_points[-1],
-                            'curvePoints': connector_points,
-                            'strokeWidth': 1,
-                            'color': '#000000'
-                        })
+        edges, connector_x, connector_y = _connectors(centers, size, t, spiral_wave)
+        for (row, col, d_row, d_col), xs, ys in zip(edges.tolist(), connector_x, connector_y):
+            connector_points = _to_points(xs, ys)
+            
+            curves.append({
+                'id': f'spiral-connector-{row}-{col}-{d_row}-{d_col}',
+                'start': connector_points[0],
+                'end': connector_points[-1],
+                'curvePoints': connector_points,
+                'strokeWidth': 1,
+                'color': '#000000'
+            })
         
-        return {
-            'id': f'spiral-kolam-{size}x{size}',
-            'name': f'Spiral Kolam {size}×{size}',
-            'grid': {
-                'size': size,
-                'cells': [[{
-                    'row': i,
-                    'col': j,
-                    'patternId': 1,
-                    'dotCenter': {
-                        'x': (j + 1) * self.cell_spacing,
-                        'y': (i + 1) * self.cell_spacing
-                    }
-                } for j in range(size)] for i in range(size)],
-                'cellSpacing': self.cell_spacing
-            },
-            'curves': curves,
-            'dots': dots,
-            'symmetryType': '2D',
-            'dimensions': {
-                'width': (size + 1) * self.cell_spacing,
-                'height': (size + 1) * self.cell_spacing
-            }
-        }
+        return self._wrap_result(size, curves, dots, 'spiral-kolam', 'Spiral Kolam')
+
+# Kolam types offered by the API; the list never changes at runtime
+_AVAILABLE_TYPES = [
+    {'id': 'traditional', 'name': 'Traditional 1D', 'description': 'Classic South Indian kolam with 1D symmetry'},
+    {'id': 'geometric', 'name': 'Geometric', 'description': 'Mathematical patterns with circles and lines'},
+    {'id': 'floral', 'name': 'Floral', 'description': 'Nature-inspired flower patterns'},
+    {'id': 'mandala', 'name': 'Mandala', 'description': 'Intricate mandala-style designs'},
+    {'id': 'spiral', 'name': 'Spiral', 'description': 'Spiral-based patterns'}
+]
 
 class KolamTypeManager:
     """Manager class for different kolam types"""
@@ -702,16 +680,13 @@ class KolamTypeManager:
             'mandala': MandalaKolamGenerator(),
             'spiral': SpiralKolamGenerator()
         }
+        # A size-15 pattern is over 10 MB, so only keep the most recent few
+        self._cached_generate = lru_cache(maxsize=8)(self._generate)
+        self._cached_render = lru_cache(maxsize=16)(self._render)
     
     def get_available_types(self) -> List[Dict[str, str]]:
-        """Get list of available kolam types"""
-        return [
-            {'id': 'traditional', 'name': 'Traditional 1D', 'description': 'Classic South Indian kolam with 1D symmetry'},
-            {'id': 'geometric', 'name': 'Geometric', 'description': 'Mathematical patterns with circles and lines'},
-            {'id': 'floral', 'name': 'Floral', 'description': 'Nature-inspired flower patterns'},
-            {'id': 'mandala', 'name': 'Mandala', 'description': 'Intricate mandala-style designs'},
-            {'id': 'spiral', 'name': 'Spiral', 'description': 'Spiral-based patterns'}
-        ]
+        """Get list of available kolam types (shared, so treat it as read-only)"""
+        return _AVAILABLE_TYPES
     
     def generate_kolam(self, kolam_type: str, size: int) -> Dict[str, Any]:
         """Generate kolam of specified type"""
@@ -719,7 +694,38 @@ class KolamTypeManager:
             raise ValueError(f"Unknown kolam type: {kolam_type}")
         
         generator = self.generators[kolam_type]
-        return generator.generate(size)
+        if not generator.deterministic:
+            return generator.generate(size)
+        
+        # Repeated requests for the same type and size share one cached
+        # pattern, which callers must treat as read-only
+        return self._cached_generate(kolam_type, size)
+    
+    def _generate(self, kolam_type: str, size: int) -> Dict[str, Any]:
+        """Cache target for deterministic generators"""
+        return self.generators[kolam_type].generate(size)
+    
+    def generate_kolam_image(self, kolam_type: str, size: int, image_size: Tuple[int, int] = (500, 500)) -> Tuple[Dict[str, Any], str]:
+        """Generate kolam of specified type together with its rendered base64 image"""
+        if kolam_type not in self.generators:
+            raise ValueError(f"Unknown kolam type: {kolam_type}")
+        
+        if not self.generators[kolam_type].deterministic:
+            pattern = self.generators[kolam_type].generate(size)
+            return pattern, zen_kolam_generator.generate_kolam_image(pattern, image_size)
+        
+        # Deterministic patterns always render to the same image, so the
+        # encoded PNG is cached alongside the pattern
+        return self._cached_generate(kolam_type, size), self._cached_render(kolam_type, size, image_size)
+    
+    def _render(self, kolam_type: str, size: int, image_size: Tuple[int, int]) -> str:
+        """Cache target for rendered images of deterministic generators"""
+        return zen_kolam_generator.generate_kolam_image(self._cached_generate(kolam_type, size), image_size)
+    
+    def clear_cache(self):
+        """Drop all cached patterns and images"""
+        self._cached_generate.cache_clear()
+        self._cached_render.cache_clear()
 
 # Global instance
 kolam_type_manager = KolamTypeManager()
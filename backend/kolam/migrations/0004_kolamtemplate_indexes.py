@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kolam', '0003_userpattern_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kolamtemplate',
+            index=models.Index(fields=['category', '-is_featured', 'name'], name='kolam_kolam_categor_82cd47_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kolamtemplate',
+            index=models.Index(fields=['is_featured', 'name'], name='kolam_kolam_is_feat_242f8c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kolamtemplate',
+            index=models.Index(fields=['difficulty', 'name'], name='kolam_kolam_difficu_61c1f8_idx'),
+        ),
+    ]
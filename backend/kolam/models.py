@@ -42,6 +42,14 @@ class KolamTemplate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        # Match the filters and orderings used by the pattern library queries
+        indexes = [
+            models.Index(fields=['category', '-is_featured', 'name']),
+            models.Index(fields=['is_featured', 'name']),
+            models.Index(fields=['difficulty', 'name']),
+        ]
+    
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
 
@@ -1,7 +1,12 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.db import transaction
 from .models import KolamTemplate, UserPattern, UserPreferences
 from .zen_kolam_generator import zen_kolam_generator
 import json
 
+logger = logging.getLogger(__name__)
+
 class PatternLibraryManager:
     def __init__(self):
         self.kolam_generator = zen_kolam_generator
@@ -62,39 +67,37 @@ class PatternLibraryManager:
         
         # Generate preview image - handle cases where we might not have full pattern data
         try:
-            print(f"🔍 Generating preview for pattern: {name}")
-            print(f"🔍 Pattern data type: {type(actual_pattern_data)}")
+            logger.debug("Generating preview for pattern: %s", name)
+            logger.debug("Pattern data type: %s", type(actual_pattern_data))
             
             if isinstance(actual_pattern_data, dict) and 'image' in actual_pattern_data:
                 # Use the existing image as preview
-                print("🔍 Using existing image as preview")
+                logger.debug("Using existing image as preview")
                 preview_image = actual_pattern_data['image']
             elif isinstance(actual_pattern_data, dict) and 'type' in actual_pattern_data and actual_pattern_data['type'] == 'digitized':
                 # For digitized patterns, use the image from the pattern data
-                print("🔍 Using digitized image as preview")
+                logger.debug("Using digitized image as preview")
                 preview_image = actual_pattern_data.get('image', '')
             else:
                 # For generated patterns, check if we have the proper structure
                 if isinstance(actual_pattern_data, dict) and 'dots' in actual_pattern_data and 'curves' in actual_pattern_data:
-                    print("🔍 Generating preview from pattern data with dots and curves")
+                    logger.debug("Generating preview from pattern data with dots and curves")
                     # Generate preview from pattern data
                     preview_image = self.kolam_generator.generate_kolam_image(actual_pattern_data, (200, 200), include_dots=True, theme=theme)
-                    print(f"🔍 Generated preview image length: {len(preview_image) if preview_image else 0}")
+                    logger.debug("Generated preview image length: %d", len(preview_image) if preview_image else 0)
                 else:
                     # If pattern data doesn't have the right structure, generate a new pattern for preview
-                    print(f"🔍 Pattern data structure: {type(actual_pattern_data)}")
+                    logger.debug("Pattern data structure: %s", type(actual_pattern_data))
                     if isinstance(actual_pattern_data, dict):
-                        print(f"🔍 Pattern data keys: {list(actual_pattern_data.keys())}")
+                        logger.debug("Pattern data keys: %s", list(actual_pattern_data))
                     
-                    print("🔍 Generating new pattern for preview")
-                    # Generate a simple pattern for preview
-                    temp_pattern = self.kolam_generator.generate_kolam_1d(grid_size)
+                    logger.debug("Generating new pattern for preview")
+                    # Generate a simple pattern for preview; it is only drawn, so skip the grid cells
+                    temp_pattern = self.kolam_generator.generate_kolam_1d(grid_size, include_cells=False)
                     preview_image = self.kolam_generator.generate_kolam_image(temp_pattern, (200, 200), include_dots=True, theme=theme)
-                    print(f"🔍 Generated temp preview image length: {len(preview_image) if preview_image else 0}")
-        except Exception as e:
-            print(f"❌ Warning: Could not generate preview image: {e}")
-            import traceback
-            traceback.print_exc()
+                    logger.debug("Generated temp preview image length: %d", len(preview_image) if preview_image else 0)
+        except Exception:
+            logger.exception("Could not generate preview image for pattern: %s", name)
             # Create a simple placeholder or use a default
             preview_image = ""
         
@@ -112,16 +115,22 @@ class PatternLibraryManager:
     def update_user_pattern(self, pattern_id, name=None, category=None, is_favorite=None):
         """Update a user pattern"""
         try:
-            pattern = UserPattern.objects.get(id=pattern_id)
+            # Only the edited columns are loaded and written; the large
+            # pattern_data and preview_image columns are left untouched
+            pattern = UserPattern.objects.only('id', 'name', 'category', 'is_favorite').get(id=pattern_id)
+            update_fields = ['updated_at']
             
             if name is not None:
                 pattern.name = name
+                update_fields.append('name')
             if category is not None:
                 pattern.category = category
+                update_fields.append('category')
             if is_favorite is not None:
                 pattern.is_favorite = is_favorite
+                update_fields.append('is_favorite')
             
-            pattern.save()
+            pattern.save(update_fields=update_fields)
             return pattern
         except UserPattern.DoesNotExist:
             raise ValueError(f"Pattern with ID {pattern_id} not found")
@@ -208,10 +217,21 @@ class PatternLibraryManager:
             }
         ]
         
-        for template_data in default_templates:
-            # Generate a simple pattern for each template
-            pattern = self.kolam_generator.generate_kolam_1d(template_data['grid_size'])
-            self.create_template_from_pattern(**template_data, pattern_data=pattern)
+        # Generate a simple pattern for each template
+        patterns = [self.kolam_generator.generate_kolam_1d(template_data['grid_size']) for template_data in default_templates]
+        
+        # Render the previews concurrently, then insert every template in one query
+        with ThreadPoolExecutor() as pool:
+            previews = list(pool.map(
+                lambda pattern: self.kolam_generator.generate_kolam_image(pattern, (200, 200), include_dots=True),
+                patterns
+            ))
+        
+        with transaction.atomic():
+            KolamTemplate.objects.bulk_create([
+                KolamTemplate(**template_data, pattern_data=pattern, preview_image=preview_image)
+                for template_data, pattern, preview_image in zip(default_templates, patterns, previews)
+            ])
 
 # Global instance
 pattern_library = PatternLibraryManager()
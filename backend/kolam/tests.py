@@ -1,3 +1,331 @@
-from django.test import TestCase
+import copy
+import random
+import time
 
-# Create your tests here.
+import cv2
+import numpy as np
+from django.test import SimpleTestCase
+
+from . import kolam_analysis
+from .customization_manager import customization_manager
+from .interactive_manager import InteractiveManager
+from .zen_kolam_generator import ZenKolamGenerator, zen_kolam_generator
+
+
+def _dot_grid_image(grid_size, radius, spacing=60, with_line=False):
+    """Dark filled dots on a white background, optionally with one short stroke."""
+    size = spacing * (grid_size + 1)
+    image = np.full((size, size, 3), 255, np.uint8)
+    for row in range(1, grid_size + 1):
+        for col in range(1, grid_size + 1):
+            cv2.circle(image, (col * spacing, row * spacing), radius, (0, 0, 0), -1)
+    if with_line:
+        cv2.line(image, (spacing + 15, spacing + 30), (2 * spacing - 15, spacing + 30), (0, 0, 0), 2)
+    return image
+
+
+def _diamond_lattice_image(grid_size, spacing=60):
+    """Dot grid with every dot enclosed by a diamond stroke through the midpoints to its neighbours."""
+    image = _dot_grid_image(grid_size, 5, spacing)
+    half = spacing // 2 - 4
+    for row in range(1, grid_size + 1):
+        for col in range(1, grid_size + 1):
+            x, y = col * spacing, row * spacing
+            diamond = np.array([(x, y - half), (x + half, y), (x, y + half), (x - half, y)], np.int32)
+            cv2.polylines(image, [diamond], True, (0, 0, 0), 2, cv2.LINE_AA)
+    return image
+
+
+def _wave_image(grid_size, spacing=60):
+    """Dot grid threaded by sine strokes running between the rows and columns."""
+    image = _dot_grid_image(grid_size, 5, spacing)
+    along = np.arange(spacing // 2, spacing * grid_size + spacing // 2)
+    offset = 12 * np.sin((along - spacing // 2) * np.pi / spacing)
+    for k in range(grid_size + 1):
+        across = k * spacing + spacing // 2
+        cv2.polylines(image, [np.stack([along, across + offset], 1).astype(np.int32)], False, (0, 0, 0), 2, cv2.LINE_AA)
+        cv2.polylines(image, [np.stack([across + offset, along], 1).astype(np.int32)], False, (0, 0, 0), 2, cv2.LINE_AA)
+    return image
+
+
+def _detect_dots(image):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    filtered = kolam_analysis._enhance_gray(gray, max(image.shape))
+    return kolam_analysis._detect_dots_ultra_advanced(filtered, image.copy())
+
+
+class DotDetectionTests(SimpleTestCase):
+    """Recall of the dot detector on synthetic dot grids, with and without strokes."""
+
+    def test_finds_every_dot(self):
+        for grid_size, radius in ((5, 4), (5, 6), (5, 10), (7, 3), (7, 8)):
+            with self.subTest(grid_size=grid_size, radius=radius):
+                dots = _detect_dots(_dot_grid_image(grid_size, radius))
+                self.assertEqual(len(dots), grid_size * grid_size)
+
+    def test_dots_land_on_grid_points(self):
+        dots = _detect_dots(_dot_grid_image(5, 6))
+        for x, y in dots:
+            self.assertLessEqual(abs(x - round(x / 60) * 60), 2)
+            self.assertLessEqual(abs(y - round(y / 60) * 60), 2)
+
+    def test_grid_size_estimate(self):
+        for grid_size, radius, with_line in ((5, 4, False), (5, 10, False), (4, 5, True)):
+            with self.subTest(grid_size=grid_size, radius=radius):
+                dots = _detect_dots(_dot_grid_image(grid_size, radius, with_line=with_line))
+                self.assertEqual(len(dots), grid_size * grid_size)
+                self.assertEqual(kolam_analysis._estimate_grid_from_dots(dots), grid_size)
+
+    def _assert_finds_grid(self, dots, grid_size, spacing=60):
+        found = {(round(x / spacing), round(y / spacing)) for x, y in dots}
+        self.assertEqual(found, {(col, row) for col in range(1, grid_size + 1) for row in range(1, grid_size + 1)})
+        for x, y in dots:
+            self.assertLessEqual(abs(x - round(x / spacing) * spacing), 4)
+            self.assertLessEqual(abs(y - round(y / spacing) * spacing), 4)
+        self.assertEqual(len(dots), grid_size * grid_size)
+
+    def test_dots_enclosed_by_strokes(self):
+        self._assert_finds_grid(_detect_dots(_diamond_lattice_image(7)), 7)
+
+    def test_dots_between_wave_strokes(self):
+        dots = _detect_dots(_wave_image(5))
+        self._assert_finds_grid(dots, 5)
+        self.assertEqual(kolam_analysis._estimate_grid_from_dots(dots), 5)
+
+
+class ProposeKolamTests(SimpleTestCase):
+    """Structure of the pattern matrices from propose_kolam_1d."""
+
+    SIZES = (3, 4, 5, 8, 9, 15)
+
+    def _matrices(self, size, count=50):
+        random.seed(size)
+        return [zen_kolam_generator.propose_kolam_1d(size) for _ in range(count)]
+
+    def test_shape_and_values(self):
+        for size in self.SIZES:
+            for matrix in self._matrices(size, 5):
+                self.assertEqual(len(matrix), size)
+                for row in matrix:
+                    self.assertEqual(len(row), size)
+                    self.assertTrue(all(1 <= value <= 16 for value in row))
+
+    def test_mirror_symmetry(self):
+        h_inv, v_inv = ZenKolamGenerator.H_INV, ZenKolamGenerator.V_INV
+        for size in self.SIZES:
+            for matrix in self._matrices(size, 10):
+                n = len(matrix)
+                for i in range(n):
+                    for j in range(n):
+                        self.assertEqual(matrix[i][n - 1 - j], h_inv[matrix[i][j] - 1])
+                        self.assertEqual(matrix[n - 1 - i][j], v_inv[matrix[i][j] - 1])
+
+    def test_neighbours_connect(self):
+        gen = ZenKolamGenerator
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                for matrix in self._matrices(size):
+                    n = len(matrix)
+                    for i in range(n):
+                        for j in range(n):
+                            value = matrix[i][j]
+                            if i + 1 < n:
+                                self.assertIn(matrix[i + 1][j], gen.MATE_PT_DN[gen.PT_DN[value - 1] + 1])
+                            if j + 1 < n:
+                                self.assertIn(matrix[i][j + 1], gen.MATE_PT_RT[gen.PT_RT[value - 1] + 1])
+
+    def test_same_seed_same_matrix(self):
+        for size in self.SIZES:
+            random.seed(42)
+            first = zen_kolam_generator.propose_kolam_1d(size)
+            random.seed(42)
+            self.assertEqual(zen_kolam_generator.propose_kolam_1d(size), first)
+
+
+def _reference_customization(pattern, options):
+    """Point-by-point implementation of the customization options."""
+    pattern = copy.deepcopy(pattern)
+    if 'line_thickness' in options:
+        pattern['line_thickness'] = options['line_thickness']
+    if 'dot_size' in options:
+        for dot in pattern['dots']:
+            dot['radius'] = options['dot_size']
+    density = options.get('pattern_density')
+    if density == 'sparse':
+        pattern['curves'] = pattern['curves'][::2]
+    elif density == 'dense':
+        shifted = copy.deepcopy(pattern['curves'][::2])
+        for curve in shifted:
+            for point in curve['curvePoints']:
+                point['x'] += 2
+                point['y'] += 2
+        pattern['curves'] = pattern['curves'] + shifted
+    
+    center_x = pattern['dimensions']['width'] / 2
+    center_y = pattern['dimensions']['height'] / 2
+    reflect = {
+        'horizontal': lambda x, y: (x, center_y - (y - center_y)),
+        'vertical': lambda x, y: (center_x - (x - center_x), y),
+        'diagonal': lambda x, y: (center_y - (y - center_y), center_x - (x - center_x)),
+    }.get(options.get('symmetry_type'))
+    if reflect:
+        mirrored = copy.deepcopy(pattern['curves'])
+        for curve in mirrored:
+            curve['curvePoints'] = [dict(zip('xy', reflect(point['x'], point['y']))) for point in curve['curvePoints']]
+        pattern['curves'] = pattern['curves'] + mirrored
+    return pattern
+
+
+class ApplyCustomizationTests(SimpleTestCase):
+    """apply_customization against a plain per-point reference."""
+
+    def setUp(self):
+        random.seed(7)
+        self.pattern = zen_kolam_generator.generate_kolam_1d(5)
+        # Non-square, so reflections that mix up the two centres are caught
+        self.pattern['dimensions'] = {'width': 360, 'height': 420}
+
+    def _assert_patterns_equal(self, actual, expected):
+        self.assertEqual(actual.keys(), expected.keys())
+        self.assertEqual(actual['dots'], expected['dots'])
+        self.assertEqual(len(actual['curves']), len(expected['curves']))
+        for curve, expected_curve in zip(actual['curves'], expected['curves']):
+            self.assertEqual(curve.keys(), expected_curve.keys())
+            for point, expected_point in zip(curve['curvePoints'], expected_curve['curvePoints']):
+                self.assertAlmostEqual(point['x'], expected_point['x'])
+                self.assertAlmostEqual(point['y'], expected_point['y'])
+
+    def test_matches_reference(self):
+        option_sets = [
+            {},
+            {'line_thickness': 4, 'dot_size': 6},
+            {'pattern_density': 'sparse'},
+            {'pattern_density': 'dense'},
+            {'symmetry_type': 'radial'},
+            {'symmetry_type': 'horizontal'},
+            {'symmetry_type': 'vertical'},
+            {'symmetry_type': 'diagonal'},
+            {'pattern_density': 'dense', 'symmetry_type': 'diagonal', 'dot_size': 2},
+        ]
+        for options in option_sets:
+            with self.subTest(options=options):
+                self._assert_patterns_equal(
+                    customization_manager.apply_customization(self.pattern, options),
+                    _reference_customization(self.pattern, options),
+                )
+
+    def test_input_is_not_modified(self):
+        original = copy.deepcopy(self.pattern)
+        customization_manager.apply_customization(
+            self.pattern, {'dot_size': 9, 'pattern_density': 'dense', 'symmetry_type': 'vertical'}
+        )
+        self.assertEqual(self.pattern, original)
+
+    def test_result_is_json_shaped(self):
+        result = customization_manager.apply_customization(self.pattern, {'symmetry_type': 'horizontal'})
+        for curve in result['curves']:
+            self.assertNotIn('_pts', curve)
+            for point in curve['curvePoints']:
+                self.assertIn(type(point['x']), (int, float))
+                self.assertIn(type(point['y']), (int, float))
+
+
+class HistoryTests(SimpleTestCase):
+    """InteractiveManager undo/redo history."""
+
+    def setUp(self):
+        random.seed(3)
+        self.base = zen_kolam_generator.generate_kolam_1d(3)
+        self.manager = InteractiveManager()
+
+    def tearDown(self):
+        self.manager.clear_history()
+
+    def _pattern(self, step):
+        pattern = dict(self.base, step=step)
+        if step % 3 == 0:
+            pattern['line_thickness'] = step
+        if step % 7 == 0:
+            del pattern['symmetryType']
+        return pattern
+
+    def test_matches_list_model(self):
+        rng = random.Random(11)
+        model, position = [], -1
+        step = 0
+        for _ in range(200):
+            action = rng.choice(('add', 'add', 'undo', 'redo'))
+            if action == 'add':
+                step += 1
+                pattern = self._pattern(step)
+                self.manager.add_to_history(pattern)
+                model = model[:position + 1] + [pattern]
+                if len(model) > self.manager.max_history_size:
+                    model.pop(0)
+                position = len(model) - 1
+            elif action == 'undo':
+                result = self.manager.undo()
+                if position > 0:
+                    position -= 1
+                    self.assertEqual(result, model[position])
+                else:
+                    self.assertIsNone(result)
+            else:
+                result = self.manager.redo()
+                if position < len(model) - 1:
+                    position += 1
+                    self.assertEqual(result, model[position])
+                else:
+                    self.assertIsNone(result)
+            
+            if not model:
+                continue
+            self.assertEqual(self.manager.get_current_pattern(), model[position])
+            self.assertEqual(self.manager.current_history_index, position)
+            self.assertEqual(self.manager.can_undo(), position > 0)
+            self.assertEqual(self.manager.can_redo(), position < len(model) - 1)
+        
+        for index, expected in enumerate(model):
+            self.assertEqual(self.manager.get_history_entry(index)['pattern_data'], expected)
+
+    def test_eviction_keeps_newest_entries(self):
+        total = self.manager.max_history_size + 7
+        for step in range(total):
+            self.manager.add_to_history(self._pattern(step), f'step {step}')
+        history = self.manager.get_history()
+        self.assertEqual(len(history), self.manager.max_history_size)
+        self.assertEqual([entry['pattern_data']['step'] for entry in history],
+                         list(range(total - self.manager.max_history_size, total)))
+        self.assertTrue(history[0]['preview_image'])
+
+    def test_stored_patterns_are_copies(self):
+        pattern = self._pattern(1)
+        self.manager.add_to_history(pattern)
+        pattern['dots'].clear()
+        self.assertTrue(self.manager.get_current_pattern()['dots'])
+
+    def test_rejects_patterns_it_cannot_render(self):
+        self.manager.add_to_history(self._pattern(1))
+        for pattern_data in (None, {'dots': []}, ['not', 'a', 'pattern']):
+            with self.subTest(pattern_data=pattern_data), self.assertRaises(ValueError):
+                self.manager.add_to_history(pattern_data)
+        self.assertEqual(len(self.manager.get_history()), 1)
+        self.assertFalse(self.manager.can_undo())
+
+    def test_failed_preview_is_logged(self):
+        pattern = dict(self._pattern(1), dimensions={'width': 0, 'height': 0})
+        with self.assertLogs('kolam.interactive_manager', 'ERROR') as logs:
+            self.manager.add_to_history(pattern)
+            self.assertIsNone(self.manager.get_history_entry(0)['preview_image'])
+            # The failure is logged from the render thread once the future settles
+            deadline = time.monotonic() + 5
+            while not logs.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(self.manager.get_current_pattern(), pattern)
+
+    def test_clear_history(self):
+        self.manager.add_to_history(self._pattern(1))
+        self.manager.clear_history()
+        self.assertIsNone(self.manager.get_current_pattern())
+        self.assertFalse(self.manager.can_undo())
+        self.assertEqual(self.manager.get_history(), [])
@@ -1,8 +1,9 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
+import logging
 from .models import KolamDesign, KolamTemplate
 from .kolam_analysis import analyze_kolam_image
 from .kolam_logic import create_digitized_kolam, create_custom_grid_kolam
@@ -12,6 +13,28 @@ from .pattern_library import pattern_library
 from .customization_manager import customization_manager
 from .interactive_manager import interactive_manager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# The kolam type list is static, so type validation is a set lookup
+_AVAILABLE_TYPE_IDS = frozenset(t['id'] for t in kolam_type_manager.get_available_types())
+
+def _json_response(payload, status=200):
+    """JSON API response; encodes with orjson when installed"""
+    if orjson is None:
+        return JsonResponse(payload, status=status)
+    return HttpResponse(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), content_type='application/json', status=status)
+
+def _read_json(request):
+    """Parse a JSON request body; decodes with orjson when installed"""
+    if orjson is None:
+        return json.loads(request.body)
+    return orjson.loads(request.body)
+
 # View for the home page
 def index(request):
     return render(request, 'index.html')
@@ -26,7 +49,7 @@ def analyze_kolam(request):
     """API endpoint to analyze uploaded kolam image."""
     try:
         if 'kolam_image' not in request.FILES:
-            return JsonResponse({'error': 'No image uploaded'}, status=400)
+            return _json_response({'error': 'No image uploaded'}, status=400)
         
         uploaded_image = request.FILES['kolam_image']
         image_bytes = uploaded_image.read()
@@ -47,7 +70,7 @@ def analyze_kolam(request):
             custom_grid_size=grid_size
         )
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'analyzed_image': analyzed_image_b64,
             'digitized_image': digitized_image_b64,
@@ -56,23 +79,23 @@ def analyze_kolam(request):
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def generate_kolam(request):
     """API endpoint to generate custom grid kolam using zen-kolam algorithm."""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         dots = int(data.get('dots', 9))
         theme = data.get('theme', 'traditional')
         
         # Validate grid size
         if dots < 3 or dots > 15:
-            return JsonResponse({'error': 'Grid size must be between 3 and 15'}, status=400)
+            return _json_response({'error': 'Grid size must be between 3 and 15'}, status=400)
         
         # Generate kolam using zen-kolam algorithm
-        print(f"🎨 Generating zen-kolam with {dots}x{dots} grid in {theme} theme")
+        logger.info("Generating zen-kolam with %dx%d grid in %s theme", dots, dots, theme)
         kolam_pattern = zen_kolam_generator.generate_kolam_1d(dots)
         
         # Convert to image with theme
@@ -86,7 +109,7 @@ def generate_kolam(request):
             analyzed_image=generated_image_b64  # Store the generated image
         )
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'generated_image': generated_image_b64,
             'grid_size': dots,
@@ -100,8 +123,8 @@ def generate_kolam(request):
         })
         
     except Exception as e:
-        print(f"Error generating kolam: {str(e)}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.exception("Error generating kolam")
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["GET"])
@@ -109,37 +132,34 @@ def get_kolam_types(request):
     """API endpoint to get available kolam types."""
     try:
         types = kolam_type_manager.get_available_types()
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'types': types
         })
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def generate_kolam_by_type(request):
     """API endpoint to generate kolam by type."""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         kolam_type = data.get('type', 'traditional')
         dots = int(data.get('dots', 9))
         
         # Validate grid size
         if dots < 3 or dots > 15:
-            return JsonResponse({'error': 'Grid size must be between 3 and 15'}, status=400)
+            return _json_response({'error': 'Grid size must be between 3 and 15'}, status=400)
         
         # Validate kolam type
-        available_types = [t['id'] for t in kolam_type_manager.get_available_types()]
-        if kolam_type not in available_types:
-            return JsonResponse({'error': f'Invalid kolam type. Available types: {available_types}'}, status=400)
+        if not isinstance(kolam_type, str) or kolam_type not in _AVAILABLE_TYPE_IDS:
+            available_types = [t['id'] for t in kolam_type_manager.get_available_types()]
+            return _json_response({'error': f'Invalid kolam type. Available types: {available_types}'}, status=400)
         
         # Generate kolam by type
-        print(f"🎨 Generating {kolam_type} kolam with {dots}x{dots} grid")
-        pattern = kolam_type_manager.generate_kolam(kolam_type, dots)
-        
-        # Convert to image
-        generated_image_b64 = zen_kolam_generator.generate_kolam_image(pattern, (500, 500))
+        logger.info("Generating %s kolam with %dx%d grid", kolam_type, dots, dots)
+        pattern, generated_image_b64 = kolam_type_manager.generate_kolam_image(kolam_type, dots, (500, 500))
         
         # Save to database
         kolam_design = KolamDesign.objects.create(
@@ -149,7 +169,7 @@ def generate_kolam_by_type(request):
             analyzed_image=generated_image_b64
         )
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'generated_image': generated_image_b64,
             'grid_size': dots,
@@ -165,8 +185,8 @@ def generate_kolam_by_type(request):
         })
         
     except Exception as e:
-        print(f"Error generating {kolam_type} kolam: {str(e)}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.exception("Error generating kolam by type")
+        return _json_response({'error': str(e)}, status=500)
 
 # Pattern Library APIs
 @csrf_exempt
@@ -187,39 +207,34 @@ def get_templates(request):
         else:
             templates = pattern_library.get_templates_by_category()
         
-        templates_data = []
-        for template in templates:
-            templates_data.append({
-                'id': template.id,
-                'name': template.name,
-                'description': template.description,
-                'category': template.category,
-                'difficulty': template.difficulty,
-                'grid_size': template.grid_size,
-                'preview_image': template.preview_image,
-                'is_featured': template.is_featured,
-                'created_at': template.created_at.isoformat()
-            })
+        # Read only the listed columns as plain dicts; pattern_data is never
+        # loaded and no model instances are built
+        templates_data = list(templates.values(
+            'id', 'name', 'description', 'category', 'difficulty',
+            'grid_size', 'preview_image', 'is_featured', 'created_at'
+        ))
+        for template in templates_data:
+            template['created_at'] = template['created_at'].isoformat()
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'templates': templates_data
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def load_template(request):
     """Load a specific template"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         template_id = data.get('template_id')
         
         template = KolamTemplate.objects.get(id=template_id)
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'template': {
                 'id': template.id,
@@ -234,9 +249,9 @@ def load_template(request):
         })
         
     except KolamTemplate.DoesNotExist:
-        return JsonResponse({'error': 'Template not found'}, status=404)
+        return _json_response({'error': 'Template not found'}, status=404)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 # User Patterns APIs
 @csrf_exempt
@@ -244,7 +259,8 @@ def load_template(request):
 def get_user_patterns(request):
     """Get user patterns"""
     try:
-        patterns = pattern_library.get_user_patterns()
+        # The listing never returns pattern_data, so skip loading and parsing it
+        patterns = pattern_library.get_user_patterns().defer('pattern_data')
         
         patterns_data = []
         for pattern in patterns:
@@ -259,20 +275,20 @@ def get_user_patterns(request):
                 'created_at': pattern.created_at.isoformat()
             })
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'patterns': patterns_data
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def save_user_pattern(request):
     """Save a user pattern"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         
         pattern = pattern_library.save_user_pattern(
             name=data.get('name'),
@@ -283,25 +299,25 @@ def save_user_pattern(request):
             category=data.get('category', 'generated')
         )
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'pattern_id': pattern.id,
             'message': 'Pattern saved successfully'
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def update_user_pattern(request):
     """Update a user pattern"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         pattern_id = data.get('pattern_id')
         
         if not pattern_id:
-            return JsonResponse({'error': 'Pattern ID is required'}, status=400)
+            return _json_response({'error': 'Pattern ID is required'}, status=400)
         
         # Update pattern using pattern_library
         updated_pattern = pattern_library.update_user_pattern(
@@ -311,7 +327,7 @@ def update_user_pattern(request):
             is_favorite=data.get('is_favorite', False)
         )
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'message': 'Pattern updated successfully',
             'pattern': {
@@ -323,32 +339,32 @@ def update_user_pattern(request):
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def delete_user_pattern(request):
     """Delete a user pattern"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         pattern_id = data.get('pattern_id')
         
         if not pattern_id:
-            return JsonResponse({'error': 'Pattern ID is required'}, status=400)
+            return _json_response({'error': 'Pattern ID is required'}, status=400)
         
         # Delete pattern using pattern_library
         success = pattern_library.delete_user_pattern(pattern_id)
         
         if success:
-            return JsonResponse({
+            return _json_response({
                 'success': True,
                 'message': 'Pattern deleted successfully'
             })
         else:
-            return JsonResponse({'error': 'Pattern not found or could not be deleted'}, status=404)
+            return _json_response({'error': 'Pattern not found or could not be deleted'}, status=404)
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 # Customization APIs
 @csrf_exempt
@@ -356,7 +372,7 @@ def delete_user_pattern(request):
 def generate_customized_kolam(request):
     """Generate a kolam with customizations"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         grid_size = int(data.get('grid_size', 9))
         theme = data.get('theme', 'traditional')
         customization_options = data.get('customization_options', {})
@@ -369,7 +385,7 @@ def generate_customized_kolam(request):
         # Generate image
         generated_image_b64 = zen_kolam_generator.generate_kolam_image(pattern, (500, 500), include_dots=True, theme=theme)
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'pattern_data': pattern,
             'generated_image': generated_image_b64,
@@ -378,7 +394,7 @@ def generate_customized_kolam(request):
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 # Interactive Features APIs
 @csrf_exempt
@@ -386,20 +402,20 @@ def generate_customized_kolam(request):
 def add_to_history(request):
     """Add pattern to history"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         pattern_data = data.get('pattern_data')
         action_name = data.get('action_name', 'Pattern Change')
         
         interactive_manager.add_to_history(pattern_data, action_name)
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'can_undo': interactive_manager.can_undo(),
             'can_redo': interactive_manager.can_redo()
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
@@ -409,20 +425,20 @@ def undo_action(request):
         pattern_data = interactive_manager.undo()
         
         if pattern_data:
-            return JsonResponse({
+            return _json_response({
                 'success': True,
                 'pattern_data': pattern_data,
                 'can_undo': interactive_manager.can_undo(),
                 'can_redo': interactive_manager.can_redo()
             })
         else:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': 'Nothing to undo'
             })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
@@ -432,27 +448,27 @@ def redo_action(request):
         pattern_data = interactive_manager.redo()
         
         if pattern_data:
-            return JsonResponse({
+            return _json_response({
                 'success': True,
                 'pattern_data': pattern_data,
                 'can_undo': interactive_manager.can_undo(),
                 'can_redo': interactive_manager.can_redo()
             })
         else:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': 'Nothing to redo'
             })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def generate_realtime_preview(request):
     """Generate real-time preview"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         grid_size = int(data.get('grid_size', 9))
         theme = data.get('theme', 'traditional')
         customization_options = data.get('customization_options', {})
@@ -461,14 +477,14 @@ def generate_realtime_preview(request):
             grid_size, theme, customization_options
         )
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'pattern_data': preview_data['pattern_data'],
             'preview_image': preview_data['preview_image']
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 # User Preferences APIs
 @csrf_exempt
@@ -478,7 +494,7 @@ def get_user_preferences(request):
     try:
         preferences = pattern_library.get_user_preferences()
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'preferences': {
                 'default_theme': preferences.default_theme,
@@ -492,21 +508,21 @@ def get_user_preferences(request):
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def update_user_preferences(request):
     """Update user preferences"""
     try:
-        data = json.loads(request.body)
+        data = _read_json(request)
         
         preferences = pattern_library.update_user_preferences(**data)
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'message': 'Preferences updated successfully'
         })
         
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
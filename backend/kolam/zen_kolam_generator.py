@@ -8,10 +8,29 @@ import random
 from typing import List, Dict, Tuple, Any
 from PIL import Image, ImageDraw
 import io
-import base64
+import logging
+from functools import lru_cache
+from operator import itemgetter
 import json
 import os
 
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+logger = logging.getLogger(__name__)
+
+# Theme color definitions
+_THEME_COLORS = {
+    'traditional': {'background': '#ffffff', 'stroke': '#000000', 'fill': '#000000'},
+    'colorful': {'background': '#ffffff', 'stroke': '#ff6b6b', 'fill': '#4ecdc4'},
+    'golden': {'background': '#fff8e1', 'stroke': '#ff8f00', 'fill': '#ffb300'},
+    'ocean': {'background': '#e3f2fd', 'stroke': '#1976d2', 'fill': '#03a9f4'},
+    'sunset': {'background': '#fce4ec', 'stroke': '#e91e63', 'fill': '#ff9800'},
+    'forest': {'background': '#f1f8e9', 'stroke': '#388e3c', 'fill': '#689f38'}
+}
+
 class ZenKolamGenerator:
     """Traditional South Indian kolam pattern generator using mathematical algorithms"""
     
@@ -36,9 +55,16 @@ class ZenKolamGenerator:
     
     def __init__(self):
         self.cell_spacing = 60
+        # The dataset is parsed once per process and shared by every instance,
+        # so it must be treated as read-only
         self.patterns_data = self._load_patterns_data()
+        # Each pattern's points as (x, y) tuples, indexed by pattern id - 1
+        self._pattern_points = [[(point['x'], point['y']) for point in pattern['points']]
+                                for pattern in self.patterns_data['patterns']]
     
-    def _load_patterns_data(self) -> Dict:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_patterns_data() -> Dict:
         """Load kolam patterns data from JSON file.
 
         The repository stores the canonical dataset at `generator_kolam/src/data/kolamPatternsData.json`.
@@ -60,13 +86,14 @@ class ZenKolamGenerator:
                     with open(abs_path, 'r') as f:
                         return json.load(f)
             except Exception as e:
-                print(f"Warning: Failed reading kolam patterns from {abs_path}: {e}")
+                logger.warning("Failed reading kolam patterns from %s: %s", abs_path, e)
 
         # Fallback to basic patterns if nothing found
-        print("Warning: Using built-in basic patterns; dataset file not found.")
-        return self._create_basic_patterns()
+        logger.warning("Using built-in basic patterns; dataset file not found.")
+        return ZenKolamGenerator._create_basic_patterns()
     
-    def _create_basic_patterns(self) -> Dict:
+    @staticmethod
+    def _create_basic_patterns() -> Dict:
         """Create basic pattern data as fallback"""
         return {
             "patterns": [
@@ -85,20 +112,8 @@ class ZenKolamGenerator:
             ]
         }
     
-    def _find_self_inverse(self, inv_array: List[int]) -> List[int]:
-        """Find self-inverse elements"""
-        result = []
-        for i in range(len(inv_array)):
-            if inv_array[i] == i + 1:  # 1-indexed
-                result.append(i + 1)
-        return result
-    
-    def _intersect(self, arr1: List[int], arr2: List[int]) -> List[int]:
-        """Array intersection"""
-        return [x for x in arr1 if x in arr2]
-    
     def _random_choice(self, arr: List[int]) -> int:
-        """Random array element selector"""
+        """Random array element selector; an empty domain falls back to pattern 1"""
         if not arr:
             return 1
         return random.choice(arr)
@@ -122,23 +137,12 @@ class ZenKolamGenerator:
         # Initialize matrix
         Mat = self._ones(hp + 2)
         
-        # Generate pattern using connectivity rules
+        # Generate pattern using connectivity rules; the allowed patterns for a
+        # cell are the AND of the masks permitted by its upper and left neighbours
         for i in range(1, hp + 1):
             for j in range(1, hp + 1):
-                # Get valid patterns based on neighbors
-                pt_dn_value = self.PT_DN[Mat[i - 1][j] - 1]
-                valid_by_up = self.MATE_PT_DN[pt_dn_value + 1]
-                
-                pt_rt_value = self.PT_RT[Mat[i][j - 1] - 1]
-                valid_by_lt = self.MATE_PT_RT[pt_rt_value + 1]
-                
-                valids = self._intersect(valid_by_up, valid_by_lt)
-                
-                try:
-                    v = self._random_choice(valids)
-                    Mat[i][j] = v
-                except:
-                    Mat[i][j] = 1
+                valids = _MASK_PATTERNS[_VALID_BELOW[Mat[i - 1][j]] & _VALID_RIGHT_OF[Mat[i][j - 1]]]
+                Mat[i][j] = self._random_choice(valids)
         
         # Set boundary conditions
         Mat[hp + 1][0] = 1
@@ -146,116 +150,57 @@ class ZenKolamGenerator:
         
         # Fill remaining cells with symmetry constraints
         for j in range(1, hp + 1):
-            pt_dn_value = self.PT_DN[Mat[hp][j] - 1]
-            valid_by_up = self.MATE_PT_DN[pt_dn_value + 1]
-            
-            pt_rt_value = self.PT_RT[Mat[hp + 1][j - 1] - 1]
-            valid_by_lt = self.MATE_PT_RT[pt_rt_value + 1]
-            
-            valids = self._intersect(valid_by_up, valid_by_lt)
-            valids = self._intersect(valids, self._find_self_inverse(self.V_INV))
-            
-            try:
-                v = self._random_choice(valids)
-                Mat[hp + 1][j] = v
-            except:
-                Mat[hp + 1][j] = 1
+            valids = _MASK_PATTERNS[_VALID_BELOW[Mat[hp][j]] & _VALID_RIGHT_OF[Mat[hp + 1][j - 1]] & _V_SELF_INVERSE]
+            Mat[hp + 1][j] = self._random_choice(valids)
         
         for i in range(1, hp + 1):
-            pt_dn_value = self.PT_DN[Mat[i - 1][hp + 1] - 1]
-            valid_by_up = self.MATE_PT_DN[pt_dn_value + 1]
-            
-            pt_rt_value = self.PT_RT[Mat[i][hp] - 1]
-            valid_by_lt = self.MATE_PT_RT[pt_rt_value + 1]
-            
-            valids = self._intersect(valid_by_up, valid_by_lt)
-            valids = self._intersect(valids, self._find_self_inverse(self.H_INV))
-            
-            try:
-                v = self._random_choice(valids)
-                Mat[i][hp + 1] = v
-            except:
-                Mat[i][hp + 1] = 1
+            mask = _VALID_BELOW[Mat[i - 1][hp + 1]] & _VALID_RIGHT_OF[Mat[i][hp]] & _H_SELF_INVERSE
+            if i == hp:
+                # Forward check: the cell above the corner only takes patterns that
+                # leave the corner a valid choice, instead of forcing it to 1
+                mask &= _CORNER_SAFE_ABOVE[Mat[hp + 1][hp]]
+            Mat[i][hp + 1] = self._random_choice(_MASK_PATTERNS[mask])
         
         # Corner cell
-        pt_dn_value = self.PT_DN[Mat[hp][hp + 1] - 1]
-        valid_by_up = self.MATE_PT_DN[pt_dn_value + 1]
-        
-        pt_rt_value = self.PT_RT[Mat[hp + 1][hp] - 1]
-        valid_by_lt = self.MATE_PT_RT[pt_rt_value + 1]
-        
-        valids = self._intersect(valid_by_up, valid_by_lt)
-        valids = self._intersect(valids, self._find_self_inverse(self.H_INV))
-        valids = self._intersect(valids, self._find_self_inverse(self.V_INV))
+        valids = _MASK_PATTERNS[
+            _VALID_BELOW[Mat[hp][hp + 1]] & _VALID_RIGHT_OF[Mat[hp + 1][hp]] & _H_SELF_INVERSE & _V_SELF_INVERSE
+        ]
         
-        try:
-            v = self._random_choice(valids)
-            Mat[hp + 1][hp + 1] = v
-        except:
-            Mat[hp + 1][hp + 1] = 1
+        Mat[hp + 1][hp + 1] = self._random_choice(valids)
         
         # Extract core pattern
-        Mat1 = [[Mat[i][j] for j in range(1, hp + 1)] for i in range(1, hp + 1)]
+        Mat1 = [row[1:hp + 1] for row in Mat[1:hp + 1]]
         
-        # Apply symmetry transformations
-        Mat3 = [[self.V_INV[Mat1[hp - 1 - i][j] - 1] for j in range(hp)] for i in range(hp)]
-        Mat2 = [[self.H_INV[Mat1[i][hp - 1 - j] - 1] for j in range(hp)] for i in range(hp)]
-        Mat4 = [[self.V_INV[Mat2[hp - 1 - i][j] - 1] for j in range(hp)] for i in range(hp)]
+        # Apply symmetry transformations: Mat2 mirrors Mat1 left-right, Mat3
+        # top-bottom and Mat4 both ways
+        Mat2 = [[self.H_INV[v - 1] for v in reversed(row)] for row in Mat1]
+        Mat3 = [[self.V_INV[v - 1] for v in row] for row in reversed(Mat1)]
+        Mat4 = [[self.V_INV[v - 1] for v in row] for row in reversed(Mat2)]
         
-        # Assemble final matrix
+        # Assemble final matrix row by row
         if odd:
-            size = 2 * hp + 1
-            M = [[1 for _ in range(size)] for _ in range(size)]
-            
-            # Copy Mat1
-            for i in range(hp):
-                for j in range(hp):
-                    M[i][j] = Mat1[i][j]
-            
-            # Add boundary elements
-            for i in range(1, hp + 1):
-                M[i - 1][hp] = Mat[i][hp + 1]
-            
-            for i in range(hp):
-                for j in range(hp):
-                    M[i][hp + 1 + j] = Mat2[i][j]
-            
-            for j in range(1, hp + 2):
-                M[hp][j - 1] = Mat[hp + 1][j]
-            
-            for j in range(hp, 0, -1):
-                M[hp][hp + (hp - j + 1)] = self.H_INV[Mat[hp + 1][j] - 1]
-            
-            for i in range(hp):
-                for j in range(hp):
-                    M[hp + 1 + i][j] = Mat3[i][j]
-            
-            for i in range(hp, 0, -1):
-                M[hp + (hp - i + 1)][hp] = self.V_INV[Mat[i][hp + 1] - 1]
-            
-            for i in range(hp):
-                for j in range(hp):
-                    M[hp + 1 + i][hp + 1 + j] = Mat4[i][j]
+            # Odd sizes add a centre row and column built from the boundary cells
+            middle = Mat[hp + 1][1:hp + 2] + [self.H_INV[v - 1] for v in reversed(Mat[hp + 1][1:hp + 1])]
+            M = (
+                [left + [Mat[i + 1][hp + 1]] + right for i, (left, right) in enumerate(zip(Mat1, Mat2))]
+                + [middle]
+                + [left + [self.V_INV[Mat[hp - i][hp + 1] - 1]] + right for i, (left, right) in enumerate(zip(Mat3, Mat4))]
+            )
         else:
-            size = 2 * hp
-            M = [[1 for _ in range(size)] for _ in range(size)]
-            
-            # Copy all four quadrants
-            for i in range(hp):
-                for j in range(hp):
-                    M[i][j] = Mat1[i][j]
-                    M[i][hp + j] = Mat2[i][j]
-                    M[hp + i][j] = Mat3[i][j]
-                    M[hp + i][hp + j] = Mat4[i][j]
+            M = [left + right for left, right in zip(Mat1, Mat2)] + [left + right for left, right in zip(Mat3, Mat4)]
         
         return M
     
-    def draw_kolam(self, matrix: List[List[int]]) -> Dict[str, Any]:
-        """Convert matrix to visual kolam pattern"""
+    def draw_kolam(self, matrix: List[List[int]], include_cells: bool = True) -> Dict[str, Any]:
+        """Convert matrix to visual kolam pattern; `include_cells=False` omits grid['cells']"""
         m, n = len(matrix), len(matrix[0])
         
-        # Flip matrix vertically
-        flipped_matrix = [matrix[m - 1 - i][:] for i in range(m)]
+        # Flip matrix vertically; rows are only read, so they are shared rather than copied
+        flipped_matrix = matrix[::-1]
+        
+        # Dot centre coordinates of every column and row, shared by the dots and grid cells
+        center_x = (np.arange(1, n + 1) * self.cell_spacing).tolist()
+        center_y = (np.arange(1, m + 1) * self.cell_spacing).tolist()
         
         dots = []
         curves = []
@@ -267,8 +212,8 @@ class ZenKolamGenerator:
                     dots.append({
                         'id': f'dot-{i}-{j}',
                         'center': {
-                            'x': (j + 1) * self.cell_spacing,
-                            'y': (i + 1) * self.cell_spacing
+                            'x': center_x[j],
+                            'y': center_y[i]
                         },
                         'radius': 3,
                         'color': '#000000',
@@ -278,14 +223,11 @@ class ZenKolamGenerator:
                     # Add curve pattern
                     pattern_id = flipped_matrix[i][j] - 1
                     if pattern_id < len(self.patterns_data['patterns']):
-                        pattern = self.patterns_data['patterns'][pattern_id]
-                        curve_points = []
-                        
-                        for point in pattern['points']:
-                            curve_points.append({
-                                'x': ((j + 1) + point['x']) * self.cell_spacing,
-                                'y': ((i + 1) + point['y']) * self.cell_spacing
-                            })
+                        col, row, spacing = j + 1, i + 1, self.cell_spacing
+                        curve_points = [
+                            {'x': (col + x) * spacing, 'y': (row + y) * spacing}
+                            for x, y in self._pattern_points[pattern_id]
+                        ]
                         
                         if len(curve_points) > 1:
                             curves.append({
@@ -297,22 +239,25 @@ class ZenKolamGenerator:
                                 'color': '#000000'
                             })
         
+        # The per-cell grid is only needed by consumers of the pattern data,
+        # not for rendering, so callers that only draw it can skip it
+        grid = {'size': max(m, n)}
+        if include_cells:
+            grid['cells'] = [[{
+                'row': i,
+                'col': j,
+                'patternId': flipped_matrix[i][j],
+                'dotCenter': {
+                    'x': center_x[j],
+                    'y': center_y[i]
+                }
+            } for j in range(n)] for i in range(m)]
+        grid['cellSpacing'] = self.cell_spacing
+        
         return {
             'id': f'kolam-{m}x{n}',
             'name': f'Kolam {m}×{n}',
-            'grid': {
-                'size': max(m, n),
-                'cells': [[{
-                    'row': i,
-                    'col': j,
-                    'patternId': flipped_matrix[i][j],
-                    'dotCenter': {
-                        'x': (j + 1) * self.cell_spacing,
-                        'y': (i + 1) * self.cell_spacing
-                    }
-                } for j in range(n)] for i in range(m)],
-                'cellSpacing': self.cell_spacing
-            },
+            'grid': grid,
             'curves': curves,
             'dots': dots,
             'symmetryType': '1D',
@@ -322,15 +267,15 @@ class ZenKolamGenerator:
             }
         }
     
-    def generate_kolam_1d(self, size: int) -> Dict[str, Any]:
+    def generate_kolam_1d(self, size: int, include_cells: bool = True) -> Dict[str, Any]:
         """Main entry point - generate kolam pattern"""
-        print(f"🎨 Generating 1D Kolam of size {size}")
+        logger.debug("Generating 1D Kolam of size %d", size)
         
         matrix = self.propose_kolam_1d(size)
-        print(f"📊 Generated matrix: {len(matrix)}x{len(matrix[0])}")
+        logger.debug("Generated matrix: %dx%d", len(matrix), len(matrix[0]))
         
-        pattern = self.draw_kolam(matrix)
-        print(f"✅ Created kolam with {len(pattern['dots'])} dots and {len(pattern['curves'])} curves")
+        pattern = self.draw_kolam(matrix, include_cells)
+        logger.debug("Created kolam with %d dots and %d curves", len(pattern['dots']), len(pattern['curves']))
         
         return pattern
     
@@ -347,7 +292,7 @@ class ZenKolamGenerator:
         dots = pattern['dots']
         curves = pattern['curves']
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        parts = [f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{dimensions['width']}" height="{dimensions['height']}" viewBox="0 0 {dimensions['width']} {dimensions['height']}" xmlns="http://www.w3.org/2000/svg" style="max-width: 100%; height: auto; background-color: {background};">
     <defs>
         <style>
@@ -362,57 +307,44 @@ class ZenKolamGenerator:
                 fill: {brush};
             }}
         </style>
-    </defs>'''
+    </defs>''']
         
         # Add dots
         for dot in dots:
-            svg_content += f'''
+            parts.append(f'''
     <circle class="kolam-dot"
         cx="{dot['center']['x']}" 
         cy="{dot['center']['y']}" 
         r="{dot.get('radius', 3)}" 
         fill="{brush}" 
         stroke="{brush}" 
-        stroke-width="1"/>'''
+        stroke-width="1"/>''')
         
         # Add curves
+        xy = itemgetter('x', 'y')
         for curve in curves:
             if 'curvePoints' in curve and len(curve['curvePoints']) > 1:
-                # Create SVG path
-                path_data = "M"
-                for i, point in enumerate(curve['curvePoints']):
-                    if i == 0:
-                        path_data += f" {point['x']},{point['y']}"
-                    else:
-                        path_data += f" L {point['x']},{point['y']}"
+                # Create SVG path: "M x0,y0 L x1,y1 ..." in one join
+                path_data = "M " + " L ".join([f"{x},{y}" for x, y in map(xy, curve['curvePoints'])])
                 
-                svg_content += f'''
-    <path class="kolam-curve" d="{path_data}"/>'''
+                parts.append(f'''
+    <path class="kolam-curve" d="{path_data}"/>''')
             else:
                 # Simple line
-                svg_content += f'''
-    <line class="kolam-curve" x1="{curve['start']['x']}" y1="{curve['start']['y']}" x2="{curve['end']['x']}" y2="{curve['end']['y']}"/>'''
+                parts.append(f'''
+    <line class="kolam-curve" x1="{curve['start']['x']}" y1="{curve['start']['y']}" x2="{curve['end']['x']}" y2="{curve['end']['y']}"/>''')
         
-        svg_content += '''
-</svg>'''
+        parts.append('''
+</svg>''')
         
-        return svg_content
+        # Join once instead of growing one string with every element
+        return ''.join(parts)
     
     def generate_kolam_image(self, pattern: Dict[str, Any], image_size: Tuple[int, int] = (500, 500), include_dots: bool = True, theme: str = 'traditional') -> str:
         """Generate PIL image from kolam pattern and return as base64"""
         width, height = image_size
         
-        # Theme color definitions
-        theme_colors = {
-            'traditional': {'background': '#ffffff', 'stroke': '#000000', 'fill': '#000000'},
-            'colorful': {'background': '#ffffff', 'stroke': '#ff6b6b', 'fill': '#4ecdc4'},
-            'golden': {'background': '#fff8e1', 'stroke': '#ff8f00', 'fill': '#ffb300'},
-            'ocean': {'background': '#e3f2fd', 'stroke': '#1976d2', 'fill': '#03a9f4'},
-            'sunset': {'background': '#fce4ec', 'stroke': '#e91e63', 'fill': '#ff9800'},
-            'forest': {'background': '#f1f8e9', 'stroke': '#388e3c', 'fill': '#689f38'}
-        }
-        
-        colors = theme_colors.get(theme, theme_colors['traditional'])
+        colors = _THEME_COLORS.get(theme, _THEME_COLORS['traditional'])
         image = Image.new('RGB', (width, height), colors['background'])
         draw = ImageDraw.Draw(image)
         
@@ -423,38 +355,78 @@ class ZenKolamGenerator:
         scale_y = height / pattern_height
         scale = min(scale_x, scale_y) * 0.8  # Leave some padding
         
-        # Draw dots if requested
-        if include_dots and 'dots' in pattern:
-            for dot in pattern['dots']:
-                center_x = int(dot['center']['x'] * scale + width * 0.1)
-                center_y = int(dot['center']['y'] * scale + height * 0.1)
-                radius = int(dot['radius'] * scale)
-                draw.ellipse([center_x - radius, center_y - radius, center_x + radius, center_y + radius], 
-                           fill=colors['fill'], outline=colors['stroke'])
-        
-        # Draw curves
+        # Draw dots if requested; all bounding boxes are computed in one NumPy pass
+        if include_dots and pattern.get('dots'):
+            xy = itemgetter('x', 'y')
+            centers = np.array([xy(dot['center']) for dot in pattern['dots']], dtype=np.float64)
+            centers = (centers * scale + np.array([width * 0.1, height * 0.1])).astype(np.int64)
+            radii = (np.array([dot['radius'] for dot in pattern['dots']], dtype=np.float64) * scale).astype(np.int64)[:, None]
+            for box in np.hstack([centers - radii, centers + radii]).tolist():
+                draw.ellipse(box, fill=colors['fill'], outline=colors['stroke'])
+        
+        # Draw curves: every polyline is packed into one coordinate buffer so
+        # scaling and truncation to pixels happen in a single NumPy pass
+        polylines = []
         for curve in pattern['curves']:
             if 'curvePoints' in curve and len(curve['curvePoints']) > 1:
-                points = []
-                for point in curve['curvePoints']:
-                    x = int(point['x'] * scale + width * 0.1)
-                    y = int(point['y'] * scale + height * 0.1)
-                    points.append((x, y))
-                
-                if len(points) > 1:
-                    draw.line(points, fill=colors['stroke'], width=2)
+                polylines.append(curve['curvePoints'])
             else:
-                start_x = int(curve['start']['x'] * scale + width * 0.1)
-                start_y = int(curve['start']['y'] * scale + height * 0.1)
-                end_x = int(curve['end']['x'] * scale + width * 0.1)
-                end_y = int(curve['end']['y'] * scale + height * 0.1)
-                draw.line([(start_x, start_y), (end_x, end_y)], fill=colors['stroke'], width=2)
+                polylines.append((curve['start'], curve['end']))
+        
+        if polylines:
+            xy = itemgetter('x', 'y')
+            coords = np.array([xy(point) for points in polylines for point in points], dtype=np.float64)
+            coords = (coords * scale + np.array([width * 0.1, height * 0.1])).astype(np.int64).ravel().tolist()
+            
+            offset = 0
+            for points in polylines:
+                end = offset + 2 * len(points)
+                draw.line(coords[offset:end], fill=colors['stroke'], width=2)
+                offset = end
         
         # Convert to base64
         buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode("utf-8")
+        # Fast deflate, as in the other renderers: encode time matters more than size
+        image.save(buffered, format="PNG", compress_level=1)
+        # Encode straight from the buffer's memory instead of copying it out first
+        return base64.b64encode(buffered.getbuffer()).decode("ascii")
+
 
+def _pattern_mask(pattern_ids) -> int:
+    """Bitmask with bit `id - 1` set for every pattern id"""
+    mask = 0
+    for pattern_id in pattern_ids:
+        mask |= 1 << (pattern_id - 1)
+    return mask
+
+# Connectivity rules as bitmasks, indexed by pattern id: _VALID_BELOW[p] holds the
+# patterns allowed directly below p, _VALID_RIGHT_OF[p] those allowed to its right
+_VALID_BELOW = (0,) + tuple(_pattern_mask(ZenKolamGenerator.MATE_PT_DN[pt + 1]) for pt in ZenKolamGenerator.PT_DN)
+_VALID_RIGHT_OF = (0,) + tuple(_pattern_mask(ZenKolamGenerator.MATE_PT_RT[pt + 1]) for pt in ZenKolamGenerator.PT_RT)
+
+# Patterns unchanged by the horizontal / vertical symmetry transforms
+_H_SELF_INVERSE = _pattern_mask(p for p, inv in enumerate(ZenKolamGenerator.H_INV, 1) if inv == p)
+_V_SELF_INVERSE = _pattern_mask(p for p, inv in enumerate(ZenKolamGenerator.V_INV, 1) if inv == p)
+
+# For each pattern left of the corner cell, the patterns that may sit above the
+# corner while still leaving it at least one valid pattern
+_CORNER_SAFE_ABOVE = (0,) + tuple(
+    _pattern_mask(p for p in range(1, 17) if _VALID_BELOW[p] & _VALID_RIGHT_OF[left] & _H_SELF_INVERSE & _V_SELF_INVERSE)
+    for left in range(1, 17)
+)
+
+# Candidate pattern ids, in ascending order, for every mask the generator can
+# produce (-1 stands for no symmetry or corner constraint)
+_MASK_PATTERNS = {
+    mask: tuple(p for p in range(1, 17) if mask >> (p - 1) & 1)
+    for mask in {
+        below & right & symmetry & corner
+        for below in set(_VALID_BELOW[1:])
+        for right in set(_VALID_RIGHT_OF[1:])
+        for symmetry in (-1, _H_SELF_INVERSE, _V_SELF_INVERSE, _H_SELF_INVERSE & _V_SELF_INVERSE)
+        for corner in {-1, *_CORNER_SAFE_ABOVE[1:]}
+    }
+}
 
 # Global instance for easy access
 zen_kolam_generator = ZenKolamGenerator()